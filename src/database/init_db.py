@@ -4,13 +4,16 @@ Initialize the database and load initial movie data.
 
 import sys
 import os
+import json
 import pandas as pd
 from pathlib import Path
 import yaml
 from datetime import datetime
 
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Add parent directory to path (once, even if this module is re-imported)
+SRC_DIR = str(Path(__file__).parent.parent)
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from database.models import init_database, get_session, Movie
 from utils.logger import setup_logger
@@ -59,7 +62,6 @@ def load_movies_from_csv(csv_path, session, limit=None):
                 # Parse genres (often stored as JSON string)
                 genres = row.get('genres', '[]')
                 if isinstance(genres, str):
-                    import json
                     try:
                         genres = json.loads(genres.replace("'", '"'))
                     except:
@@ -0,0 +1,5 @@
+"""Evaluation package"""
+
+from .metrics import RecommenderEvaluator
+
+__all__ = ['RecommenderEvaluator']
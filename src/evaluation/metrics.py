@@ -5,14 +5,52 @@ Placeholder/stub for future implementation.
 
 import numpy as np
 from typing import List, Dict, Tuple
-import sys
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Precomputed DCG position discounts 1/log2(rank + 1) for ranks 1..MAX_K
+MAX_K = 1000
+_LOG2_DISCOUNTS = 1.0 / np.log2(np.arange(2, MAX_K + 2))
+
+
+def _average_precision_kernel(recs: np.ndarray, relevant_sorted: np.ndarray) -> float:
+    """
+    Average Precision over int64 arrays (compiled with numba when available).
+    
+    Args:
+        recs: Recommended item IDs (ordered)
+        relevant_sorted: Sorted unique relevant item IDs
+    
+    Returns:
+        Mean precision over the ranks where a relevant item appears
+    """
+    n_relevant = relevant_sorted.shape[0]
+    hits = 0
+    precision_sum = 0.0
+    
+    for i in range(recs.shape[0]):
+        # Binary search membership test
+        pos = np.searchsorted(relevant_sorted, recs[i])
+        if pos < n_relevant and relevant_sorted[pos] == recs[i]:
+            hits += 1
+            precision_sum += hits / (i + 1)
+    
+    if hits == 0:
+        return 0.0
+    return precision_sum / hits
+
+
+if NUMBA_AVAILABLE:
+    _average_precision_kernel = njit(cache=True, fastmath=True)(_average_precision_kernel)
+
 
 class RecommenderEvaluator:
     """Evaluate recommendation system performance"""
@@ -107,18 +145,18 @@ class RecommenderEvaluator:
         if len(relevant_set) == 0:
             return 0.0
         
-        precisions = []
-        hits = 0
-        
-        for i, item in enumerate(recommendations, 1):
-            if item in relevant_set:
-                hits += 1
-                precision = hits / i
-                precisions.append(precision)
+        recs = np.asarray(recommendations)
+        hits = np.isin(recs, list(relevant_set))
         
-        if len(precisions) == 0:
+        if not hits.any():
             return 0.0
         
+        # Precision at each rank, kept only where the item is relevant
+        # (a relevant ID recommended twice counts as two hits)
+        cum_hits = np.cumsum(hits)
+        ranks = np.arange(1, len(recs) + 1)
+        precisions = cum_hits[hits] / ranks[hits]
+        
         return np.mean(precisions)
     
     def mean_average_precision(
@@ -138,7 +176,17 @@ class RecommenderEvaluator:
         """
         aps = []
         for recs, relevant in zip(all_recommendations, all_relevant):
-            ap = self.average_precision(recs, relevant)
+            recs_array = np.asarray(recs)
+            relevant_array = np.asarray(relevant)
+            if (NUMBA_AVAILABLE and np.issubdtype(recs_array.dtype, np.integer)
+                    and np.issubdtype(relevant_array.dtype, np.integer)):
+                ap = _average_precision_kernel(
+                    recs_array.astype(np.int64),
+                    np.unique(relevant_array.astype(np.int64))
+                )
+            else:
+                # Float, string or empty ID lists: an int64 cast could truncate or collide them
+                ap = self.average_precision(recs, relevant)
             aps.append(ap)
         
         return np.mean(aps)
@@ -162,16 +210,20 @@ class RecommenderEvaluator:
         """
         def dcg(relevances):
             """Calculate DCG"""
-            return np.sum([
-                (2**rel - 1) / np.log2(i + 2)
-                for i, rel in enumerate(relevances)
-            ])
+            rel = np.asarray(relevances, dtype=np.float64)
+            if len(rel) <= MAX_K:
+                discounts = _LOG2_DISCOUNTS[:len(rel)]
+            else:
+                discounts = 1.0 / np.log2(np.arange(2, len(rel) + 2))
+            return np.sum((np.exp2(rel) - 1.0) * discounts)
         
         # Get relevances for recommendations
-        rec_relevances = [
-            relevant_items.get(item, 0) 
-            for item in recommendations[:k]
-        ]
+        top_recs = recommendations[:k]
+        rec_relevances = np.fromiter(
+            (relevant_items.get(item, 0) for item in top_recs),
+            dtype=np.float64,
+            count=len(top_recs)
+        )
         
         # Get ideal relevances (sorted by relevance)
         ideal_relevances = sorted(relevant_items.values(), reverse=True)[:k]
@@ -0,0 +1,6 @@
+"""
+Recommendation models package.
+
+Submodules are imported directly (e.g. `from models.hybrid import HybridRecommender`)
+so that loading one model does not pull in every model's dependencies.
+"""
@@ -3,17 +3,17 @@ Collaborative Filtering (CF) recommendation model.
 Uses matrix factorization (SVD) for user-item ratings.
 """
 
-from sklearn.decomposition import TruncatedSVD
-from scipy.sparse import csr_matrix
+from sklearn.utils.extmath import randomized_svd
+from scipy.sparse import csr_matrix, save_npz, load_npz
 import numpy as np
+import json
+import os
 import pickle
 from typing import List, Tuple, Dict
-import sys
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
 from database.models import get_session, UserRating
 from utils.logger import setup_logger
+from utils.ranking import top_k_indices, normalize_rows
 
 logger = setup_logger(__name__)
 
@@ -29,12 +29,17 @@ class CollaborativeFilter:
             n_factors: Number of latent factors for SVD
         """
         self.n_factors = n_factors
-        self.svd = TruncatedSVD(n_components=n_factors, random_state=42)
+        self.n_iter = 4
+        self.random_state = 42
         
+        self.singular_values = None
         self.user_factors = None
         self.item_factors = None
+        self._item_factors_norm = None
         self.user_ids = None
         self.movie_ids = None
+        self.user_idx_map = None
+        self.movie_idx_map = None
         self.rating_matrix = None
     
     def fit(self, ratings: List[UserRating]):
@@ -49,38 +54,46 @@ class CollaborativeFilter:
         """
         logger.info(f"Fitting CF model on {len(ratings)} ratings")
         
-        # Build user-item rating matrix
-        user_set = set(r.user_id for r in ratings)
-        movie_set = set(r.movie_id for r in ratings)
+        # Extract rating columns once
+        n_ratings = len(ratings)
+        user_arr = np.fromiter((r.user_id for r in ratings), dtype=np.int64, count=n_ratings)
+        movie_arr = np.fromiter((r.movie_id for r in ratings), dtype=np.int64, count=n_ratings)
+        rating_arr = np.fromiter((r.rating for r in ratings), dtype=np.float32, count=n_ratings)
         
-        self.user_ids = sorted(list(user_set))
-        self.movie_ids = sorted(list(movie_set))
+        # Sorted unique IDs define the matrix rows/columns
+        unique_users = np.unique(user_arr)
+        unique_movies = np.unique(movie_arr)
         
-        user_idx_map = {uid: idx for idx, uid in enumerate(self.user_ids)}
-        movie_idx_map = {mid: idx for idx, mid in enumerate(self.movie_ids)}
+        self.user_ids = unique_users.tolist()
+        self.movie_ids = unique_movies.tolist()
         
-        # Create sparse matrix
-        rows = []
-        cols = []
-        data = []
+        # ID -> row/column lookups (O(1) instead of list.index scans)
+        self.user_idx_map = {uid: idx for idx, uid in enumerate(self.user_ids)}
+        self.movie_idx_map = {mid: idx for idx, mid in enumerate(self.movie_ids)}
         
-        for rating in ratings:
-            user_idx = user_idx_map[rating.user_id]
-            movie_idx = movie_idx_map[rating.movie_id]
-            rows.append(user_idx)
-            cols.append(movie_idx)
-            data.append(rating.rating)
+        # Create sparse matrix
+        rows = np.searchsorted(unique_users, user_arr)
+        cols = np.searchsorted(unique_movies, movie_arr)
         
         self.rating_matrix = csr_matrix(
-            (data, (rows, cols)),
-            shape=(len(self.user_ids), len(self.movie_ids))
+            (rating_arr, (rows, cols)),
+            shape=(len(self.user_ids), len(self.movie_ids)),
+            dtype=np.float32
         )
         
         logger.info(f"Rating matrix shape: {self.rating_matrix.shape}")
         
-        # Apply SVD
-        self.user_factors = self.svd.fit_transform(self.rating_matrix)
-        self.item_factors = self.svd.components_.T
+        # Apply truncated SVD directly on the float32 CSR matrix
+        U, S, Vt = randomized_svd(
+            self.rating_matrix,
+            n_components=self.n_factors,
+            n_iter=self.n_iter,
+            random_state=self.random_state
+        )
+        self.singular_values = S
+        self.user_factors = U * S
+        self.item_factors = Vt.T
+        self._item_factors_norm = normalize_rows(self.item_factors)
         
         logger.info(f"User factors shape: {self.user_factors.shape}")
         logger.info(f"Item factors shape: {self.item_factors.shape}")
@@ -98,17 +111,48 @@ class CollaborativeFilter:
         Returns:
             Predicted rating (1-5 scale typically)
         """
-        if user_id not in self.user_ids or movie_id not in self.movie_ids:
+        if user_id not in self.user_idx_map or movie_id not in self.movie_idx_map:
             return 3.0  # Default neutral rating
         
-        user_idx = self.user_ids.index(user_id)
-        movie_idx = self.movie_ids.index(movie_id)
+        user_idx = self.user_idx_map[user_id]
+        movie_idx = self.movie_idx_map[movie_id]
         
         prediction = np.dot(self.user_factors[user_idx], self.item_factors[movie_idx])
         
         # Clip to valid rating range
         return np.clip(prediction, 1.0, 5.0)
     
+    def predict_ratings(self, user_id: int, movie_ids: List[int]) -> np.ndarray:
+        """
+        Predict ratings for one user and many movies in a single product.
+        
+        Args:
+            user_id: User ID
+            movie_ids: Movie IDs to score
+        
+        Returns:
+            Array of predicted ratings (1-5), aligned with movie_ids;
+            unknown users/movies get the neutral default 3.0
+        """
+        movie_idx = np.fromiter(
+            (self.movie_idx_map.get(mid, -1) for mid in movie_ids),
+            dtype=np.int64,
+            count=len(movie_ids)
+        )
+        predictions = np.full(len(movie_idx), 3.0)  # Default neutral rating
+        
+        user_idx = self.user_idx_map.get(user_id)
+        if user_idx is None:
+            return predictions
+        
+        valid = movie_idx >= 0
+        predictions[valid] = np.clip(
+            self.item_factors[movie_idx[valid]] @ self.user_factors[user_idx],
+            1.0, 5.0
+        )
+        
+        return predictions
+    
     def recommend_for_user(
         self, 
         user_id: int, 
@@ -126,23 +170,27 @@ class CollaborativeFilter:
         Returns:
             List of (movie_id, predicted_rating) tuples
         """
-        if user_id not in self.user_ids:
+        if user_id not in self.user_idx_map:
             logger.warning(f"User {user_id} not in training data")
             return []
         
-        user_idx = self.user_ids.index(user_id)
+        user_idx = self.user_idx_map[user_id]
         
         # Predict ratings for all movies
         predictions = np.dot(self.user_factors[user_idx], self.item_factors.T)
         
         # Get rated movies for this user
         if exclude_rated:
-            user_ratings = self.rating_matrix[user_idx].toarray().flatten()
-            rated_mask = user_ratings > 0
-            predictions[rated_mask] = -np.inf  # Exclude rated movies
+            # Read the CSR row's stored entries directly (no dense row copy)
+            start, end = self.rating_matrix.indptr[user_idx:user_idx + 2]
+            rated_idx = self.rating_matrix.indices[start:end]
+            rated_idx = rated_idx[self.rating_matrix.data[start:end] > 0]
+            predictions[rated_idx] = -np.inf  # Exclude rated movies
+            # Never pad the result with excluded (-inf) movies
+            top_k = min(top_k, predictions.size - rated_idx.size)
         
         # Get top-k
-        top_indices = predictions.argsort()[::-1][:top_k]
+        top_indices = top_k_indices(predictions, top_k)
         
         recommendations = [
             (self.movie_ids[idx], float(predictions[idx]))
@@ -166,21 +214,18 @@ class CollaborativeFilter:
         Returns:
             List of (movie_id, similarity_score) tuples
         """
-        if movie_id not in self.movie_ids:
+        if movie_id not in self.movie_idx_map:
             logger.warning(f"Movie {movie_id} not in training data")
             return []
         
-        movie_idx = self.movie_ids.index(movie_id)
+        movie_idx = self.movie_idx_map[movie_id]
         
-        # Compute cosine similarity
-        from sklearn.metrics.pairwise import cosine_similarity
-        similarities = cosine_similarity(
-            [self.item_factors[movie_idx]],
-            self.item_factors
-        )[0]
+        # Cosine similarity against pre-normalized item factors
+        similarities = self._item_factors_norm @ self._item_factors_norm[movie_idx]
         
-        # Get top-k (excluding itself)
-        similar_indices = similarities.argsort()[::-1][1:top_k+1]
+        # Get top-k (excluding itself, even when top_k covers every movie)
+        similarities[movie_idx] = -np.inf
+        similar_indices = top_k_indices(similarities, min(top_k, similarities.size - 1))
         
         results = [
             (self.movie_ids[idx], float(similarities[idx]))
@@ -190,29 +235,75 @@ class CollaborativeFilter:
         return results
     
     def save(self, filepath: str):
-        """Save model to disk"""
-        with open(filepath, 'wb') as f:
-            pickle.dump({
-                'svd': self.svd,
-                'user_factors': self.user_factors,
-                'item_factors': self.item_factors,
-                'user_ids': self.user_ids,
-                'movie_ids': self.movie_ids,
-                'rating_matrix': self.rating_matrix
+        """
+        Save model to disk as native NumPy/SciPy files.
+        
+        Writes three files next to each other:
+            {filepath}.arrays.npz  - factors, singular values and IDs
+            {filepath}.ratings.npz - sparse rating matrix
+            {filepath}.json        - hyperparameters
+        """
+        np.savez_compressed(
+            f"{filepath}.arrays.npz",
+            user_factors=self.user_factors.astype(np.float32),
+            item_factors=self.item_factors.astype(np.float32),
+            singular_values=self.singular_values.astype(np.float32),
+            user_ids=np.asarray(self.user_ids, dtype=np.int64),
+            movie_ids=np.asarray(self.movie_ids, dtype=np.int64)
+        )
+        save_npz(f"{filepath}.ratings.npz", self.rating_matrix)
+        with open(f"{filepath}.json", 'w') as f:
+            json.dump({
+                'n_factors': self.n_factors,
+                'n_iter': self.n_iter,
+                'random_state': self.random_state
             }, f)
         logger.info(f"Saved CF model to {filepath}")
     
     def load(self, filepath: str):
-        """Load model from disk"""
+        """
+        Load model saved by save() from disk.
+        
+        A single pickle at filepath (the format before save() switched to
+        NumPy/SciPy files) is still read; save() again to convert it.
+        """
+        if not os.path.exists(f"{filepath}.json") and os.path.isfile(filepath):
+            self._load_legacy_pickle(filepath)
+        else:
+            with open(f"{filepath}.json", 'r') as f:
+                params = json.load(f)
+            self.n_factors = params['n_factors']
+            self.n_iter = params['n_iter']
+            self.random_state = params['random_state']
+            
+            with np.load(f"{filepath}.arrays.npz") as data:
+                self.user_factors = data['user_factors']
+                self.item_factors = data['item_factors']
+                self.singular_values = data['singular_values']
+                self.user_ids = data['user_ids'].tolist()
+                self.movie_ids = data['movie_ids'].tolist()
+            self.rating_matrix = load_npz(f"{filepath}.ratings.npz").tocsr()
+        
+        self._item_factors_norm = normalize_rows(self.item_factors)
+        self.user_idx_map = {uid: idx for idx, uid in enumerate(self.user_ids)}
+        self.movie_idx_map = {mid: idx for idx, mid in enumerate(self.movie_ids)}
+        logger.info(f"Loaded CF model from {filepath}")
+    
+    def _load_legacy_pickle(self, filepath: str):
+        """Read a model pickled by the old save() (its fitted TruncatedSVD holds the hyperparameters)"""
+        logger.warning(f"{filepath} uses the old pickle format; save the model again to convert it")
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
-            self.svd = data['svd']
-            self.user_factors = data['user_factors']
-            self.item_factors = data['item_factors']
-            self.user_ids = data['user_ids']
-            self.movie_ids = data['movie_ids']
-            self.rating_matrix = data['rating_matrix']
-        logger.info(f"Loaded CF model from {filepath}")
+        svd = data['svd']
+        self.n_factors = svd.n_components
+        self.n_iter = svd.n_iter
+        self.random_state = svd.random_state
+        self.singular_values = svd.singular_values_
+        self.user_factors = data['user_factors']
+        self.item_factors = data['item_factors']
+        self.user_ids = list(data['user_ids'])
+        self.movie_ids = list(data['movie_ids'])
+        self.rating_matrix = csr_matrix(data['rating_matrix'])
 
 
 # Stub/placeholder code
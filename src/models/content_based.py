@@ -4,24 +4,60 @@ Uses TF-IDF and embeddings for movie similarity.
 """
 
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from sentence_transformers import SentenceTransformer
+import torch
+from sqlalchemy import func
+from scipy.sparse import save_npz, load_npz
 import numpy as np
+import os
 import pickle
+from functools import lru_cache
 from typing import List, Dict, Tuple
-import sys
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
 from database.models import get_session, get_engine, Movie, Review
 from utils.logger import setup_logger
+from utils.ranking import top_k_indices, normalize_rows
 
 logger = setup_logger(__name__)
 
 
+@lru_cache(maxsize=4)
+def _get_st_model(name: str) -> SentenceTransformer:
+    """
+    Load a SentenceTransformer once per process.
+    
+    Tries the local Hugging Face cache first and only hits the Hub if the
+    model has not been downloaded yet.
+    
+    Args:
+        name: SentenceTransformer model name
+    
+    Returns:
+        Model in eval mode (shared by all ContentBasedFilter instances)
+    """
+    try:
+        model = SentenceTransformer(name, local_files_only=True)
+    except Exception:
+        model = SentenceTransformer(name)
+    return model.eval()
+
+
 class ContentBasedFilter:
     """Content-based filtering using movie metadata and reviews"""
     
+    # Embeddings are stored in half precision (half the RAM and pickle size);
+    # similarity dot products are accumulated in float32
+    EMBEDDING_DTYPE = np.float16
+    
+    # Embedding rows upcast to float32 at a time when computing similarities
+    SIMILARITY_BLOCK_ROWS = 8192
+    
+    # Texts per SentenceTransformer forward pass
+    ENCODE_BATCH_SIZE = 256
+    
+    # Similar movies pooled per liked movie in recommend_for_user
+    NEIGHBORS_PER_LIKED = 50
+    
     def __init__(self, embedding_model: str = 'all-MiniLM-L6-v2'):
         """
         Initialize CBF model.
@@ -32,23 +68,29 @@ class ContentBasedFilter:
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=5000,
             stop_words='english',
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            norm='l2'  # Unit-length rows: cosine similarity is a plain dot product
         )
         
         # Will be loaded when trained
         self.tfidf_matrix = None
         self.movie_ids = None
+        self.movie_idx_map = None
         self.movie_metadata = None
         
         # Sentence embeddings
         try:
-            self.embedding_model = SentenceTransformer(embedding_model)
+            self.embedding_model = _get_st_model(embedding_model)
             logger.info(f"Loaded embedding model: {embedding_model}")
-        except:
-            logger.warning("Could not load SentenceTransformer")
+        except Exception as e:
+            logger.warning(f"Could not load SentenceTransformer: {e}")
             self.embedding_model = None
         
         self.embeddings = None
+        self._embeddings_norm = None
+        
+        # Per-instance memo of similar-movie lists (model is immutable after fit)
+        self._similar_movies_cached = lru_cache(maxsize=4096)(self._compute_similar_movies)
     
     def fit(self, movies: List[Movie], db_session):
         """
@@ -62,15 +104,20 @@ class ContentBasedFilter:
             Self for chaining
         """
         logger.info(f"Fitting CBF model on {len(movies)} movies")
+        self.clear_cache()
         
         self.movie_ids = [m.id for m in movies]
+        self.movie_idx_map = {mid: idx for idx, mid in enumerate(self.movie_ids)}
         self.movie_metadata = {}
         
+        # Fetch top reviews for all movies up front (avoids one query per movie)
+        reviews_by_movie = self._fetch_top_reviews(self.movie_ids, db_session)
+        
         # Build text corpus for each movie
         corpus = []
         for movie in movies:
             # Combine metadata and reviews
-            text = self._build_movie_text(movie, db_session)
+            text = self._build_movie_text(movie, reviews_by_movie.get(movie.id, []))
             corpus.append(text)
             self.movie_metadata[movie.id] = {
                 'title': movie.title,
@@ -84,22 +131,106 @@ class ContentBasedFilter:
         
         # Generate embeddings if model available
         if self.embedding_model:
-            self.embeddings = self.embedding_model.encode(
-                corpus, 
-                show_progress_bar=True,
-                convert_to_numpy=True
-            )
+            self._set_embeddings(self._encode_corpus(corpus))
             logger.info(f"Embeddings shape: {self.embeddings.shape}")
         
         return self
     
-    def _build_movie_text(self, movie: Movie, db_session) -> str:
+    def _encode_corpus(self, corpus: List[str]) -> np.ndarray:
+        """
+        Encode movie texts with the SentenceTransformer.
+        
+        Runs under fp16 autocast on GPU when available (the shared model's
+        weights are left untouched) and pre-truncates texts to
+        max_seq_length words (the model truncates to that many tokens
+        anyway), so long review concatenations are not tokenized in full.
+        
+        Args:
+            corpus: Movie text strings
+        
+        Returns:
+            Unnormalized embedding matrix (n_movies x dim); _set_embeddings
+            casts and normalizes it
+        """
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        
+        max_words = self.embedding_model.max_seq_length
+        truncated = [' '.join(text.split()[:max_words]) for text in corpus]
+        
+        with torch.autocast('cuda', dtype=torch.float16, enabled=device == 'cuda'):
+            return self.embedding_model.encode(
+                truncated,
+                batch_size=self.ENCODE_BATCH_SIZE,
+                show_progress_bar=True,
+                convert_to_numpy=True,
+                device=device
+            )
+    
+    def _set_embeddings(self, embeddings: np.ndarray):
+        """
+        Store embeddings in EMBEDDING_DTYPE along with their L2-normalized rows.
+        
+        Args:
+            embeddings: Raw embedding matrix (n_movies x dim)
+        """
+        self.embeddings = np.asarray(embeddings).astype(self.EMBEDDING_DTYPE, copy=False)
+        self._embeddings_norm = normalize_rows(
+            self.embeddings.astype(np.float32)
+        ).astype(self.EMBEDDING_DTYPE)
+    
+    def _fetch_top_reviews(
+        self,
+        movie_ids: List[int],
+        db_session,
+        per_movie: int = 10,
+        chunk_size: int = 500
+    ) -> Dict[int, List[str]]:
+        """
+        Fetch the top reviews (by quality score) for many movies at once.
+        
+        Uses a ROW_NUMBER() window per movie so each chunk of movie IDs
+        is a single query instead of one query per movie.
+        
+        Args:
+            movie_ids: Movie IDs to fetch reviews for
+            db_session: Database session
+            per_movie: Maximum reviews per movie
+            chunk_size: Movie IDs per query (keeps IN lists bounded)
+        
+        Returns:
+            Dictionary mapping movie_id to list of review texts
+        """
+        reviews_by_movie = {}
+        
+        for i in range(0, len(movie_ids), chunk_size):
+            chunk = movie_ids[i:i + chunk_size]
+            
+            ranked = db_session.query(
+                Review.movie_id.label('movie_id'),
+                Review.text.label('text'),
+                func.row_number().over(
+                    partition_by=Review.movie_id,
+                    order_by=Review.quality_score.desc()
+                ).label('rank')
+            ).filter(Review.movie_id.in_(chunk)).subquery()
+            
+            rows = db_session.query(ranked.c.movie_id, ranked.c.text).filter(
+                ranked.c.rank <= per_movie
+            ).order_by(ranked.c.movie_id, ranked.c.rank).all()
+            
+            for movie_id, text in rows:
+                if text:
+                    reviews_by_movie.setdefault(movie_id, []).append(text)
+        
+        return reviews_by_movie
+    
+    def _build_movie_text(self, movie: Movie, review_texts: List[str]) -> str:
         """
         Build text representation of a movie.
         
         Args:
             movie: Movie object
-            db_session: Database session
+            review_texts: Top review texts for the movie (by quality score)
         
         Returns:
             Combined text string
@@ -116,12 +247,7 @@ class ContentBasedFilter:
         if movie.genres:
             parts.append(' '.join(movie.genres))
         
-        # Top reviews (by quality score)
-        reviews = db_session.query(Review).filter_by(
-            movie_id=movie.id
-        ).order_by(Review.quality_score.desc()).limit(10).all()
-        
-        review_texts = [r.text for r in reviews if r.text]
+        # Top reviews
         if review_texts:
             parts.append(' '.join(review_texts))
         
@@ -144,34 +270,60 @@ class ContentBasedFilter:
         Returns:
             List of (movie_id, similarity_score) tuples
         """
-        if movie_id not in self.movie_ids:
+        return list(self._similar_movies_cached(movie_id, top_k, use_embeddings))
+    
+    def _compute_similar_movies(
+        self,
+        movie_id: int,
+        top_k: int,
+        use_embeddings: bool
+    ) -> Tuple[Tuple[int, float], ...]:
+        """Uncached implementation behind get_similar_movies"""
+        if movie_id not in self.movie_idx_map:
             logger.warning(f"Movie {movie_id} not in training data")
-            return []
-        
-        movie_idx = self.movie_ids.index(movie_id)
+            return ()
         
-        if use_embeddings and self.embeddings is not None:
-            # Use embeddings
-            similarities = cosine_similarity(
-                [self.embeddings[movie_idx]], 
-                self.embeddings
-            )[0]
-        else:
-            # Use TF-IDF
-            similarities = cosine_similarity(
-                self.tfidf_matrix[movie_idx], 
-                self.tfidf_matrix
-            ).flatten()
+        movie_idx = self.movie_idx_map[movie_id]
+        similarities = self._similarity_rows(np.array([movie_idx]), use_embeddings)[0]
         
-        # Get top-k similar (excluding itself)
-        similar_indices = similarities.argsort()[::-1][1:top_k+1]
+        # Get top-k similar (excluding itself, even when top_k covers every movie)
+        similarities[movie_idx] = -np.inf
+        similar_indices = top_k_indices(similarities, min(top_k, similarities.size - 1))
         
-        results = [
+        return tuple(
             (self.movie_ids[idx], float(similarities[idx]))
             for idx in similar_indices
-        ]
+        )
+    
+    def _similarity_rows(self, movie_idx: np.ndarray, use_embeddings: bool = True) -> np.ndarray:
+        """
+        Cosine similarity of the given movies against every movie.
+        
+        Args:
+            movie_idx: Row indices of the query movies
+            use_embeddings: Use embeddings vs TF-IDF
+        
+        Returns:
+            Dense (len(movie_idx) x n_movies) similarity matrix
+        """
+        if use_embeddings and self.embeddings is not None:
+            # Use embeddings (pre-normalized rows, float32 accumulation). The
+            # float16 matrix is upcast one block at a time, so the float32
+            # temporary stays SIMILARITY_BLOCK_ROWS rows instead of the corpus
+            queries = self._embeddings_norm[movie_idx].astype(np.float32)
+            n_movies = self._embeddings_norm.shape[0]
+            sims = np.empty((len(queries), n_movies), dtype=np.float32)
+            for start in range(0, n_movies, self.SIMILARITY_BLOCK_ROWS):
+                block = self._embeddings_norm[start:start + self.SIMILARITY_BLOCK_ROWS]
+                sims[:, start:start + len(block)] = queries @ block.astype(np.float32).T
+            return sims
         
-        return results
+        # Use TF-IDF (rows are already L2-normalized, so one sparse product)
+        return (self.tfidf_matrix[movie_idx] @ self.tfidf_matrix.T).toarray()
+    
+    def clear_cache(self):
+        """Drop memoized similar-movie lists (called on fit/load)"""
+        self._similar_movies_cached.cache_clear()
     
     def recommend_for_user(
         self, 
@@ -188,46 +340,108 @@ class ContentBasedFilter:
         Returns:
             List of (movie_id, score) tuples
         """
-        # Aggregate similarities from all liked movies
-        all_scores = {}
-        
+        liked_idx = []
         for movie_id in liked_movie_ids:
-            similar = self.get_similar_movies(movie_id, top_k=50)
-            for sim_id, score in similar:
-                if sim_id not in liked_movie_ids:
-                    all_scores[sim_id] = all_scores.get(sim_id, 0) + score
+            if movie_id not in self.movie_idx_map:
+                logger.warning(f"Movie {movie_id} not in training data")
+                continue
+            liked_idx.append(self.movie_idx_map[movie_id])
         
-        # Sort and return top-k
-        sorted_movies = sorted(
-            all_scores.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:top_k]
+        n_movies = len(self.movie_ids)
+        n_neighbors = min(self.NEIGHBORS_PER_LIKED, n_movies - 1)
+        if not liked_idx or n_neighbors <= 0:
+            return []
+        liked_idx = np.asarray(liked_idx)
+        
+        # Similarities of every liked movie to all movies in one product
+        sims = self._similarity_rows(liked_idx)
+        rows = np.arange(len(liked_idx))
+        sims[rows, liked_idx] = -np.inf  # A movie is not its own neighbor
+        
+        # Each liked movie contributes its top neighbors' similarities
+        neighbors = np.argpartition(-sims, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        all_scores = np.bincount(
+            neighbors.ravel(),
+            weights=sims[rows[:, None], neighbors].ravel(),
+            minlength=n_movies
+        )
+        
+        # Only pooled neighbors that the user has not already liked are candidates
+        candidates = np.zeros(n_movies, dtype=bool)
+        candidates[neighbors.ravel()] = True
+        candidates[liked_idx] = False
+        all_scores[~candidates] = -np.inf
         
-        return sorted_movies
+        # Return top-k
+        top_indices = top_k_indices(all_scores, top_k)
+        top_indices = top_indices[candidates[top_indices]]
+        
+        return [
+            (self.movie_ids[idx], float(all_scores[idx]))
+            for idx in top_indices
+        ]
     
     def save(self, filepath: str):
-        """Save model to disk"""
-        with open(filepath, 'wb') as f:
+        """
+        Save model to disk.
+        
+        Large arrays use native NumPy/SciPy formats; only the fitted
+        vectorizer and movie metadata are pickled:
+            {filepath}.arrays.npz - movie IDs and embeddings
+            {filepath}.tfidf.npz  - sparse TF-IDF matrix
+            {filepath}.meta.pkl   - TF-IDF vectorizer and movie metadata
+        """
+        arrays = {'movie_ids': np.asarray(self.movie_ids, dtype=np.int64)}
+        if self.embeddings is not None:
+            arrays['embeddings'] = self.embeddings
+        np.savez_compressed(f"{filepath}.arrays.npz", **arrays)
+        save_npz(f"{filepath}.tfidf.npz", self.tfidf_matrix)
+        with open(f"{filepath}.meta.pkl", 'wb') as f:
             pickle.dump({
                 'tfidf_vectorizer': self.tfidf_vectorizer,
-                'tfidf_matrix': self.tfidf_matrix,
-                'movie_ids': self.movie_ids,
-                'movie_metadata': self.movie_metadata,
-                'embeddings': self.embeddings
+                'movie_metadata': self.movie_metadata
             }, f)
         logger.info(f"Saved CBF model to {filepath}")
     
     def load(self, filepath: str):
-        """Load model from disk"""
+        """
+        Load model saved by save() from disk.
+        
+        A single pickle at filepath (the format before save() split out
+        the arrays) is still read; save() again to convert it.
+        """
+        self.clear_cache()
+        self.embeddings = None
+        self._embeddings_norm = None
+        
+        if not os.path.exists(f"{filepath}.meta.pkl") and os.path.isfile(filepath):
+            self._load_legacy_pickle(filepath)
+        else:
+            with open(f"{filepath}.meta.pkl", 'rb') as f:
+                meta = pickle.load(f)
+            self.tfidf_vectorizer = meta['tfidf_vectorizer']
+            self.movie_metadata = meta['movie_metadata']
+            self.tfidf_matrix = load_npz(f"{filepath}.tfidf.npz").tocsr()
+            
+            with np.load(f"{filepath}.arrays.npz") as data:
+                self.movie_ids = data['movie_ids'].tolist()
+                if 'embeddings' in data:
+                    self._set_embeddings(data['embeddings'])
+        
+        self.movie_idx_map = {mid: idx for idx, mid in enumerate(self.movie_ids)}
+        logger.info(f"Loaded CBF model from {filepath}")
+    
+    def _load_legacy_pickle(self, filepath: str):
+        """Read a model pickled by the old save()"""
+        logger.warning(f"{filepath} uses the old pickle format; save the model again to convert it")
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
-            self.tfidf_vectorizer = data['tfidf_vectorizer']
-            self.tfidf_matrix = data['tfidf_matrix']
-            self.movie_ids = data['movie_ids']
-            self.movie_metadata = data['movie_metadata']
-            self.embeddings = data['embeddings']
-        logger.info(f"Loaded CBF model from {filepath}")
+        self.tfidf_vectorizer = data['tfidf_vectorizer']
+        self.movie_metadata = data['movie_metadata']
+        self.tfidf_matrix = data['tfidf_matrix'].tocsr()
+        self.movie_ids = list(data['movie_ids'])
+        if data['embeddings'] is not None:
+            self._set_embeddings(data['embeddings'])
 
 
 # Stub/placeholder code
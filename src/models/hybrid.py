@@ -4,13 +4,11 @@ Hybrid Recommendation System combining CBF and CF.
 
 import numpy as np
 from typing import List, Tuple, Dict
-import sys
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
 from models.content_based import ContentBasedFilter
 from models.collaborative import CollaborativeFilter
 from utils.logger import setup_logger
+from utils.ranking import top_k_indices
 
 logger = setup_logger(__name__)
 
@@ -61,14 +59,14 @@ class HybridRecommender:
         Returns:
             List of (movie_id, score) tuples
         """
-        cbf_scores = {}
-        cf_scores = {}
+        cbf_ids, cbf_arr = self._empty_scores()
+        cf_ids, cf_arr = self._empty_scores()
         
         # Get CBF recommendations
         if liked_movies and self.cbf_model:
             try:
                 cbf_recs = self.cbf_model.recommend_for_user(liked_movies, top_k=50)
-                cbf_scores = {movie_id: score for movie_id, score in cbf_recs}
+                cbf_ids, cbf_arr = self._to_arrays(cbf_recs)
             except Exception as e:
                 logger.error(f"CBF error: {e}")
         
@@ -76,36 +74,46 @@ class HybridRecommender:
         if user_id and self.cf_model:
             try:
                 cf_recs = self.cf_model.recommend_for_user(user_id, top_k=50)
-                cf_scores = {movie_id: score for movie_id, score in cf_recs}
+                cf_ids, cf_arr = self._to_arrays(cf_recs)
             except Exception as e:
                 logger.error(f"CF error: {e}")
         
-        # Combine scores
-        all_movies = set(cbf_scores.keys()) | set(cf_scores.keys())
-        hybrid_scores = {}
+        # Align both score sets on the union of candidate movies (missing = 0)
+        all_movies = np.union1d(cbf_ids, cf_ids)
+        if all_movies.size == 0:
+            return []
         
-        for movie_id in all_movies:
-            cbf_score = cbf_scores.get(movie_id, 0)
-            cf_score = cf_scores.get(movie_id, 0)
-            
-            # Weighted combination
-            hybrid_scores[movie_id] = (
-                self.alpha * self._normalize_score(cbf_score, max_score=1.0) +
-                self.beta * self._normalize_score(cf_score, max_score=5.0)
-            )
+        cbf_aligned = np.zeros(all_movies.size)
+        cbf_aligned[np.searchsorted(all_movies, cbf_ids)] = cbf_arr
+        cf_aligned = np.zeros(all_movies.size)
+        cf_aligned[np.searchsorted(all_movies, cf_ids)] = cf_arr
         
-        # Sort and return top-k
-        recommendations = sorted(
-            hybrid_scores.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:top_k]
+        # Normalize to 0-1 (CBF similarities are 0-1, CF ratings 1-5) and weight
+        hybrid_scores = (
+            self.alpha * np.clip(cbf_aligned, 0.0, 1.0) +
+            self.beta * np.clip(cf_aligned / 5.0, 0.0, 1.0)
+        )
         
-        return recommendations
+        # Return top-k
+        top_indices = top_k_indices(hybrid_scores, top_k)
+        
+        return list(zip(
+            all_movies[top_indices].tolist(),
+            hybrid_scores[top_indices].tolist()
+        ))
+    
+    @staticmethod
+    def _empty_scores() -> Tuple[np.ndarray, np.ndarray]:
+        """Empty (movie_ids, scores) arrays"""
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
     
-    def _normalize_score(self, score: float, max_score: float = 1.0) -> float:
-        """Normalize score to 0-1 range"""
-        return min(max(score / max_score, 0.0), 1.0)
+    @staticmethod
+    def _to_arrays(recs: List[Tuple[int, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Split (movie_id, score) tuples into parallel ID and score arrays"""
+        if not recs:
+            return HybridRecommender._empty_scores()
+        ids, scores = zip(*recs)
+        return np.asarray(ids, dtype=np.int64), np.asarray(scores, dtype=np.float64)
     
     def explain_recommendation(
         self, 
@@ -124,40 +132,66 @@ class HybridRecommender:
         Returns:
             Dictionary with explanation details
         """
-        explanation = {
+        return self.explain_recommendations([movie_id], user_id, liked_movies)[0]
+    
+    def explain_recommendations(
+        self,
+        movie_ids: List[int],
+        user_id: int = None,
+        liked_movies: List[int] = None
+    ) -> List[Dict]:
+        """
+        Explain several recommended movies at once.
+        
+        Similar-movie lists are fetched once per liked movie and CF ratings
+        come from a single predict_ratings call, rather than once per
+        explained movie.
+        
+        Args:
+            movie_ids: Recommended movie IDs
+            user_id: User ID
+            liked_movies: Liked movie IDs
+        
+        Returns:
+            List of explanation dictionaries (see explain_recommendation),
+            aligned with movie_ids
+        """
+        explanations = [{
             'movie_id': movie_id,
             'cbf_contribution': 0.0,
             'cf_contribution': 0.0,
             'similar_movies': [],
             'user_similarity': None
-        }
+        } for movie_id in movie_ids]
         
         # CBF explanation
         if liked_movies and self.cbf_model:
-            # Find which liked movie is most similar
-            max_sim = 0.0
-            most_similar = None
-            
+            # Find which liked movie is most similar to each candidate
+            # (first liked movie wins ties)
+            best = {}
             for liked_id in liked_movies:
                 similar = self.cbf_model.get_similar_movies(liked_id, top_k=20)
                 for sim_id, score in similar:
-                    if sim_id == movie_id and score > max_sim:
-                        max_sim = score
-                        most_similar = liked_id
+                    if score > best.get(sim_id, (0.0, None))[0]:
+                        best[sim_id] = (score, liked_id)
             
-            explanation['cbf_contribution'] = max_sim * self.alpha
-            explanation['similar_movies'] = [most_similar] if most_similar else []
+            for explanation in explanations:
+                max_sim, most_similar = best.get(explanation['movie_id'], (0.0, None))
+                explanation['cbf_contribution'] = max_sim * self.alpha
+                explanation['similar_movies'] = [most_similar] if most_similar else []
         
         # CF explanation
         if user_id and self.cf_model:
-            predicted_rating = self.cf_model.predict_rating(user_id, movie_id)
-            explanation['cf_contribution'] = (predicted_rating / 5.0) * self.beta
+            predicted_ratings = self.cf_model.predict_ratings(user_id, movie_ids)
+            for explanation, predicted_rating in zip(explanations, predicted_ratings.tolist()):
+                explanation['cf_contribution'] = (predicted_rating / 5.0) * self.beta
         
-        explanation['total_score'] = (
-            explanation['cbf_contribution'] + explanation['cf_contribution']
-        )
+        for explanation in explanations:
+            explanation['total_score'] = (
+                explanation['cbf_contribution'] + explanation['cf_contribution']
+            )
         
-        return explanation
+        return explanations
     
     def save(self, cbf_path: str, cf_path: str):
         """Save both models"""
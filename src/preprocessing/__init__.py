@@ -0,0 +1,6 @@
+"""
+Review preprocessing package (sentiment analysis and quality weighting).
+
+Submodules are imported directly so that the stubs do not load transformer
+dependencies.
+"""
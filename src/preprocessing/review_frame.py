@@ -0,0 +1,107 @@
+"""
+Column-oriented container for batches of reviews.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+def _numeric_column(reviews: List[Dict], key: str, default: float, dtype) -> np.ndarray:
+    """
+    Extract one numeric field from all reviews, sanitized in a single pass.
+    
+    Args:
+        reviews: List of review dictionaries
+        key: Field to extract
+        default: Value for missing or non-numeric entries
+        dtype: NumPy dtype of the returned column
+    
+    Returns:
+        Array aligned with reviews
+    """
+    column = pd.to_numeric(
+        pd.Series([r.get(key) for r in reviews], dtype=object),
+        errors='coerce'
+    )
+    return column.fillna(default).to_numpy(dtype=dtype)
+
+
+class ReviewFrame:
+    """
+    Struct-of-arrays view of a batch of reviews.
+    
+    Each field is one column aligned by row, so preprocessing passes can work
+    on whole columns instead of looking up dictionary keys per review.
+    Missing or non-numeric values become 0 for counts and lengths, NaN for
+    rating and the sentiment columns, NaT for review_date and '' for source.
+    """
+    
+    def __init__(
+        self,
+        text: List[str],
+        review_length: np.ndarray,
+        helpful_count: np.ndarray,
+        upvotes: np.ndarray,
+        source: pd.Categorical,
+        review_date: np.ndarray,
+        rating: np.ndarray,
+        sentiment_score: np.ndarray,
+        sentiment_confidence: np.ndarray
+    ):
+        """
+        Initialize from prepared columns (see from_dicts).
+        
+        Args:
+            text: Review texts
+            review_length: float64 character counts
+            helpful_count: float64 helpful votes
+            upvotes: float64 upvotes / likes
+            source: Categorical source names
+            review_date: datetime64[ns] (UTC) review dates
+            rating: float32 ratings
+            sentiment_score: float32 sentiment scores (-1 to 1)
+            sentiment_confidence: float32 sentiment confidences
+        """
+        self.text = text
+        self.review_length = review_length
+        self.helpful_count = helpful_count
+        self.upvotes = upvotes
+        self.source = source
+        self.review_date = review_date
+        self.rating = rating
+        self.sentiment_score = sentiment_score
+        self.sentiment_confidence = sentiment_confidence
+    
+    @classmethod
+    def from_dicts(cls, reviews: List[Dict]) -> 'ReviewFrame':
+        """
+        Build a frame from review dictionaries (one pass per field).
+        
+        Args:
+            reviews: List of review dictionaries
+        
+        Returns:
+            ReviewFrame with one row per review
+        """
+        dates = pd.to_datetime(
+            pd.Series([r.get('review_date') or None for r in reviews], dtype=object),
+            errors='coerce',
+            utc=True,
+            format='mixed'
+        )
+        
+        return cls(
+            text=[r.get('text') or '' for r in reviews],
+            review_length=_numeric_column(reviews, 'review_length', 0, np.float64),
+            helpful_count=_numeric_column(reviews, 'helpful_count', 0, np.float64),
+            upvotes=_numeric_column(reviews, 'upvotes', 0, np.float64),
+            source=pd.Categorical([r.get('source') or '' for r in reviews]),
+            review_date=dates.dt.tz_convert(None).to_numpy(dtype='datetime64[ns]'),
+            rating=_numeric_column(reviews, 'rating', np.nan, np.float32),
+            sentiment_score=_numeric_column(reviews, 'sentiment_score', np.nan, np.float32),
+            sentiment_confidence=_numeric_column(reviews, 'sentiment_confidence', np.nan, np.float32)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.text)
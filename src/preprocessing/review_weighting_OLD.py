@@ -3,16 +3,120 @@ Review quality scoring and weighting algorithm.
 """
 
 import math
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict
-import sys
-from pathlib import Path
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
 
-sys.path.append(str(Path(__file__).parent.parent))
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+from preprocessing.review_frame import ReviewFrame
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Recency decay reaches its 0.4 floor this many days after a review
+RECENCY_MAX_DAYS = 1095 + 3650
+
+
+def _recency_decay(days_old: np.ndarray) -> np.ndarray:
+    """
+    Recency score for whole days since a review.
+    
+    Recent (< 30 days): 1.0, 1 year: 0.8, 3 years: 0.6, 13+ years: 0.4
+    """
+    return np.select(
+        [days_old < 30, days_old < 365, days_old < 1095],
+        [1.0, 0.8 + 0.2 * (1 - days_old / 365), 0.6 + 0.2 * (1 - (days_old - 365) / 730)],
+        default=np.maximum(0.4, 0.6 - (days_old - 1095) / 3650 * 0.2)
+    )
+
+
+# Recency score per day, indexed by days_old clipped to [0, RECENCY_MAX_DAYS]
+RECENCY_LUT = _recency_decay(np.arange(RECENCY_MAX_DAYS + 1, dtype=np.float64))
+
+
+def _as_number(value, default: float) -> float:
+    """
+    Coerce one review field to a number, as ReviewFrame.from_dicts does per column.
+    
+    Missing, NaN and non-numeric values (e.g. 'n/a') become default.
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if math.isnan(number) else number
+
+
+def _fused_quality_kernel(
+    lengths: np.ndarray,
+    engagement_score: np.ndarray,
+    recency_score: np.ndarray,
+    source_score: np.ndarray,
+    confidence: np.ndarray,
+    has_confidence: np.ndarray,
+    weights: np.ndarray
+) -> np.ndarray:
+    """
+    Combined quality scores in a single pass (compiled with numba when available).
+    
+    Applies the same length bins as the scalar scorer, then the weighted
+    combination and 0-1 clip, reading each row once.
+    
+    Args:
+        lengths: Review lengths
+        engagement_score: Precomputed engagement scores
+        recency_score: Precomputed recency scores
+        source_score: Precomputed source credibility scores
+        confidence: Sentiment confidence values
+        has_confidence: False where sentiment was not analyzed
+        weights: Factor weights (length, engagement, recency, source, confidence)
+    
+    Returns:
+        Array of quality scores (0-1)
+    """
+    n = lengths.shape[0]
+    scores = np.empty(n, dtype=np.float64)
+    
+    for i in prange(n):
+        length = lengths[i]
+        if length < 20:
+            length_score = 0.0
+        elif length < 100:
+            length_score = 0.5
+        elif length < 300:
+            length_score = 0.75
+        elif length < 1000:
+            length_score = 1.0
+        elif length < 5000:
+            length_score = 0.9
+        else:
+            length_score = 0.7
+        
+        confidence_score = confidence[i] if has_confidence[i] else 0.5
+        
+        total = (
+            weights[0] * length_score +
+            weights[1] * engagement_score[i] +
+            weights[2] * recency_score[i] +
+            weights[3] * source_score[i] +
+            weights[4] * confidence_score
+        )
+        scores[i] = min(max(total, 0.0), 1.0)
+    
+    return scores
+
+
+if NUMBA_AVAILABLE:
+    _fused_quality_kernel = njit(parallel=True, cache=True, fastmath=True)(_fused_quality_kernel)
+
 
 class ReviewWeighter:
     """Calculate quality scores for reviews based on multiple factors"""
@@ -34,6 +138,13 @@ class ReviewWeighter:
         'twitter': 0.5
     }
     
+    # Engagement threshold per source, indexed by category code; the last
+    # slot covers unknown sources and Rotten Tomatoes is fixed at 0.5
+    ENGAGEMENT_SOURCES = ['imdb', 'reddit', 'twitter', 'rotten_tomatoes']
+    _ENGAGEMENT_CODES = {source: i for i, source in enumerate(ENGAGEMENT_SOURCES)}
+    ENGAGEMENT_THRESHOLDS = np.array([100, 50, 20, 1, 10], dtype=np.float64)
+    INV_LOG_ENGAGEMENT_THRESHOLDS = 1.0 / np.log1p(ENGAGEMENT_THRESHOLDS)
+    
     def __init__(self, weights: Dict = None):
         """
         Initialize review weighter.
@@ -57,29 +168,24 @@ class ReviewWeighter:
         Returns:
             Quality score (0-1)
         """
-        try:
-            # Calculate individual scores
-            length_score = self._score_length(review)
-            engagement_score = self._score_engagement(review)
-            recency_score = self._score_recency(review)
-            source_score = self._score_source(review)
-            confidence_score = self._score_sentiment_confidence(review)
-            
-            # Weighted combination
-            total_score = (
-                self.weights['length_weight'] * length_score +
-                self.weights['engagement_weight'] * engagement_score +
-                self.weights['recency_weight'] * recency_score +
-                self.weights['source_weight'] * source_score +
-                self.weights['sentiment_confidence_weight'] * confidence_score
-            )
-            
-            # Normalize to 0-1
-            return min(max(total_score, 0.0), 1.0)
-            
-        except Exception as e:
-            logger.error(f"Error calculating quality score: {e}")
-            return 0.5  # Default middle score
+        # Calculate individual scores
+        length_score = self._score_length(review)
+        engagement_score = self._score_engagement(review)
+        recency_score = self._score_recency(review)
+        source_score = self._score_source(review)
+        confidence_score = self._score_sentiment_confidence(review)
+        
+        # Weighted combination
+        total_score = (
+            self.weights['length_weight'] * length_score +
+            self.weights['engagement_weight'] * engagement_score +
+            self.weights['recency_weight'] * recency_score +
+            self.weights['source_weight'] * source_score +
+            self.weights['sentiment_confidence_weight'] * confidence_score
+        )
+        
+        # Normalize to 0-1
+        return min(max(total_score, 0.0), 1.0)
     
     def _score_length(self, review: Dict) -> float:
         """
@@ -93,7 +199,7 @@ class ReviewWeighter:
         Returns:
             Length score (0-1)
         """
-        length = review.get('review_length', 0)
+        length = _as_number(review.get('review_length'), 0)
         
         # Define bins with scores
         if length < 20:
@@ -119,18 +225,18 @@ class ReviewWeighter:
         Returns:
             Engagement score (0-1)
         """
-        source = review.get('source', '')
+        source = review.get('source') or ''
         
         # Get relevant engagement metric based on source
         if source == 'imdb':
-            engagement = review.get('helpful_count', 0)
+            engagement = _as_number(review.get('helpful_count'), 0)
             # IMDb helpful counts can be high
             threshold = 100
         elif source == 'reddit':
-            engagement = review.get('upvotes', 0)
+            engagement = _as_number(review.get('upvotes'), 0)
             threshold = 50
         elif source == 'twitter':
-            engagement = review.get('upvotes', 0)  # Likes
+            engagement = _as_number(review.get('upvotes'), 0)  # Likes
             threshold = 20
         elif source == 'rotten_tomatoes':
             # RT doesn't always have engagement metrics
@@ -146,7 +252,7 @@ class ReviewWeighter:
             return 1.0
         else:
             # Logarithmic interpolation
-            score = 0.3 + 0.7 * (math.log(engagement + 1) / math.log(threshold + 1))
+            score = 0.3 + 0.7 * (np.log1p(engagement) / np.log1p(threshold))
             return min(score, 1.0)
     
     def _score_recency(self, review: Dict) -> float:
@@ -161,36 +267,20 @@ class ReviewWeighter:
         Returns:
             Recency score (0-1)
         """
-        review_date = review.get('review_date')
+        # Handles datetime objects and date strings alike; unparseable -> NaT
+        try:
+            review_date = pd.to_datetime(review.get('review_date') or None, errors='coerce', utc=True)
+        except (TypeError, ValueError):
+            review_date = None  # Not a date-like value at all (e.g. a list)
         
-        if not review_date:
-            return 0.5  # Neutral if no date
+        if not isinstance(review_date, pd.Timestamp) or pd.isna(review_date):
+            return 0.5  # Neutral if no (valid) date
         
-        try:
-            # Calculate days since review
-            if isinstance(review_date, str):
-                review_date = datetime.fromisoformat(review_date)
-            
-            days_old = (datetime.utcnow() - review_date).days
-            
-            # Decay function
-            # Recent (< 30 days): 1.0
-            # 1 year: 0.8
-            # 3 years: 0.6
-            # 10+ years: 0.4
-            
-            if days_old < 30:
-                return 1.0
-            elif days_old < 365:
-                return 0.8 + 0.2 * (1 - days_old / 365)
-            elif days_old < 1095:  # 3 years
-                return 0.6 + 0.2 * (1 - (days_old - 365) / 730)
-            else:
-                return max(0.4, 0.6 - (days_old - 1095) / 3650 * 0.2)
-                
-        except Exception as e:
-            logger.error(f"Error calculating recency score: {e}")
-            return 0.5
+        # Calculate days since review
+        days_old = (pd.Timestamp.now(tz='UTC') - review_date).days
+        
+        # Decay curve from _recency_decay, precomputed per day
+        return float(RECENCY_LUT[min(max(days_old, 0), RECENCY_MAX_DAYS)])
     
     def _score_source(self, review: Dict) -> float:
         """
@@ -202,7 +292,7 @@ class ReviewWeighter:
         Returns:
             Source score (0-1)
         """
-        source = review.get('source', '').lower()
+        source = str(review.get('source') or '').lower()
         return self.SOURCE_SCORES.get(source, 0.5)
     
     def _score_sentiment_confidence(self, review: Dict) -> float:
@@ -215,43 +305,166 @@ class ReviewWeighter:
         Returns:
             Confidence score (0-1)
         """
-        confidence = review.get('sentiment_confidence')
-        
-        if confidence is None:
-            return 0.5  # Neutral if not analyzed yet
-        
-        return float(confidence)
+        # Neutral if not analyzed yet (or not a number)
+        return _as_number(review.get('sentiment_confidence'), 0.5)
     
     def batch_score_reviews(self, reviews: list) -> list:
         """
         Calculate quality scores for multiple reviews.
         
+        Scores are computed column-wise with NumPy (same factors as
+        calculate_quality_score) rather than one review at a time.
+        
         Args:
             reviews: List of review dictionaries
         
         Returns:
             Same list with 'quality_score' field added
         """
-        for review in reviews:
-            review['quality_score'] = self.calculate_quality_score(review)
+        if not reviews:
+            return reviews
+        
+        for review, score in zip(reviews, self._quality_scores(reviews).tolist()):
+            review['quality_score'] = score
         
         return reviews
     
-    def filter_low_quality(self, reviews: list, threshold: float = 0.3) -> list:
+    def score_reviews(self, reviews: Union[list, ReviewFrame]) -> np.ndarray:
+        """
+        Calculate quality scores without modifying the review dictionaries.
+        
+        Args:
+            reviews: List of review dictionaries, or a ReviewFrame
+        
+        Returns:
+            float32 array of quality scores (0-1), aligned with reviews
+        """
+        return self._quality_scores(reviews).astype(np.float32)
+    
+    def _quality_scores(self, reviews: Union[list, ReviewFrame]) -> np.ndarray:
+        """Batch quality scores as float64"""
+        with self._neutral_scores_on_error(len(reviews)) as scores:
+            if isinstance(reviews, ReviewFrame):
+                scores[:] = self._batch_quality_scores(reviews)
+            elif reviews:
+                scores[:] = self._batch_quality_scores(ReviewFrame.from_dicts(reviews))
+        
+        return scores
+    
+    @contextmanager
+    def _neutral_scores_on_error(self, n_reviews: int):
+        """Yield a preallocated score array, reset to the default middle score if scoring fails"""
+        scores = np.empty(n_reviews, dtype=np.float64)
+        try:
+            yield scores
+        except Exception as e:
+            logger.error(f"Error calculating quality scores: {e}")
+            scores.fill(0.5)
+    
+    def _batch_quality_scores(self, frame: ReviewFrame) -> np.ndarray:
+        """
+        Vectorized quality scores for a batch of reviews.
+        
+        Args:
+            frame: Reviews as columns
+        
+        Returns:
+            Array of quality scores (0-1), aligned with the frame's rows
+        """
+        lengths = frame.review_length
+        confidence = frame.sentiment_confidence.astype(np.float64)
+        
+        # Per-source lookups are resolved once per distinct source, then
+        # gathered through the categorical codes
+        categories = frame.source.categories
+        category_codes = frame.source.codes.astype(np.int64)
+        
+        # Engagement: per-source metric and threshold, as in _score_engagement
+        other = len(self.ENGAGEMENT_SOURCES)  # Slot for unknown sources
+        engagement_codes = np.array(
+            [self._ENGAGEMENT_CODES.get(c, other) for c in categories] + [other],
+            dtype=np.int64
+        )
+        codes = engagement_codes[category_codes]
+        engagement = np.where(codes == 0, frame.helpful_count, frame.upvotes).astype(np.float64)
+        engagement[codes >= 3] = 0.0  # Rotten Tomatoes / other: no metric
+        engagement_score = np.clip(
+            0.3 + 0.7 * np.log1p(np.maximum(engagement, 0)) * self.INV_LOG_ENGAGEMENT_THRESHOLDS[codes],
+            0.3,
+            1.0
+        )
+        engagement_score[codes == 3] = 0.5
+        
+        # Source credibility (case-insensitive)
+        source_table = np.array([self.SOURCE_SCORES.get(c.lower(), 0.5) for c in categories] + [0.5])
+        source_score = source_table[category_codes]
+        
+        # Recency: table lookup on whole days since each review, neutral when no date
+        now = pd.Timestamp.now(tz='UTC').tz_convert(None).to_datetime64()
+        days_old = np.floor((now - frame.review_date) / np.timedelta64(1, 'D'))
+        has_date = ~np.isnan(days_old)
+        recency_score = np.full(len(frame), 0.5)
+        recency_score[has_date] = RECENCY_LUT[
+            np.clip(days_old[has_date], 0, RECENCY_MAX_DAYS).astype(np.int64)
+        ]
+        
+        weights = np.array([
+            self.weights['length_weight'],
+            self.weights['engagement_weight'],
+            self.weights['recency_weight'],
+            self.weights['source_weight'],
+            self.weights['sentiment_confidence_weight']
+        ])
+        
+        if NUMBA_AVAILABLE:
+            # Length, confidence and the weighted sum in one pass
+            return _fused_quality_kernel(
+                lengths, engagement_score, recency_score,
+                source_score, confidence, ~np.isnan(confidence), weights
+            )
+        
+        # Length: same bins as _score_length
+        length_score = np.select(
+            [lengths < 20, lengths < 100, lengths < 300, lengths < 1000, lengths < 5000],
+            [0.0, 0.5, 0.75, 1.0, 0.9],
+            default=0.7
+        )
+        
+        # Sentiment confidence (neutral if not analyzed yet)
+        confidence_score = np.where(np.isnan(confidence), 0.5, confidence)
+        
+        # Weighted combination
+        stacked = np.vstack([
+            length_score, engagement_score, recency_score, source_score, confidence_score
+        ])
+        
+        return np.clip(weights @ stacked, 0.0, 1.0)
+    
+    def filter_low_quality(
+        self,
+        reviews: list,
+        threshold: float = 0.3,
+        scores: np.ndarray = None
+    ) -> list:
         """
         Filter out low-quality reviews.
         
         Args:
             reviews: List of review dictionaries
             threshold: Minimum quality score (0-1)
+            scores: Scores aligned with reviews (e.g. from score_reviews);
+                read from each review's 'quality_score' if None
         
         Returns:
             Filtered list of reviews
         """
-        filtered = [
-            r for r in reviews 
-            if r.get('quality_score', 0) >= threshold
-        ]
+        if scores is None:
+            filtered = [
+                r for r in reviews 
+                if r.get('quality_score', 0) >= threshold
+            ]
+        else:
+            filtered = [reviews[i] for i in np.flatnonzero(np.asarray(scores) >= threshold)]
         
         logger.info(f"Filtered {len(reviews)} reviews -> {len(filtered)} (threshold={threshold})")
         return filtered
@@ -0,0 +1,6 @@
+"""
+Scrapers package.
+
+Submodules are imported directly (e.g. `from scrapers.imdb_scraper import IMDbScraper`)
+so that each scraper only loads its own dependencies.
+"""
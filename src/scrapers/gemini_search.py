@@ -2,63 +2,292 @@
 OpenAI API integration for generating search terms and hashtags for movies.
 """
 
-from openai import OpenAI
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+    Timeout,
+)
+from pydantic import BaseModel, ValidationError, field_validator
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+import asyncio
+import hashlib
 import yaml
 import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
-import sys
+from typing import List, Dict, Optional, Tuple
 import os
 from dotenv import load_dotenv
 
-sys.path.append(str(Path(__file__).parent.parent))
 from utils.logger import setup_logger
+from utils.scraping import json_dumps, json_loads
+
+# Optional: exact token counts (falls back to ~4 characters per token)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 logger = setup_logger(__name__)
 
+# Transient API errors worth retrying (with exponential backoff + jitter)
+retry_transient = retry(
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception_type(
+        (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+    ),
+    reraise=True
+)
+
+# On-disk cache of generated search terms; bump PROMPT_VERSION whenever the
+# prompt changes so stale entries are no longer hit
+SEARCH_TERMS_CACHE_DIR = Path.home() / '.cache' / 'hybrid-rec-sys' / 'search_terms'
+PROMPT_VERSION = 4
+
+# Search terms expected per platform (the prompts ask for the same range)
+MIN_TERMS = 3
+MAX_TERMS = 5
+
+# Plot overview budget in the prompt
+OVERVIEW_MAX_TOKENS = 80
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """tiktoken encoding for a model, or None if tiktoken or its data is unavailable"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        logger.warning("tiktoken encoding unavailable, estimating tokens from length: %s", e)
+        return None
+
+
+# libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=1)
+def _load_api_key() -> str:
+    """Load API key from .env file or config file (read once per process)"""
+    # First try loading from .env file
+    env_path = Path(__file__).parent.parent.parent / '.env'
+    if env_path.exists():
+        load_dotenv(env_path)
+        api_key = os.getenv('OPENAI_API_KEY')
+        if api_key:
+            logger.info("Loaded OpenAI API key from .env file")
+            return api_key
+    
+    # Fall back to config file
+    config_path = Path(__file__).parent.parent.parent / 'config' / 'api_keys.yaml'
+    try:
+        with open(config_path, 'r') as f:
+            config = yaml.load(f, Loader=YAML_LOADER)
+            api_key = config.get('openai', {}).get('api_key')
+            if api_key:
+                logger.info("Loaded OpenAI API key from config file")
+                return api_key
+    except Exception as e:
+        logger.warning("Could not load from config: %s", e)
+    
+    raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in .env file or config/api_keys.yaml")
+
+
+# Per-request timeout (fail fast on connect, allow slow completions)
+REQUEST_TIMEOUT = Timeout(60.0, connect=5.0)
+
+# Resumable batches: fsync the JSONL checkpoint after this many appended movies
+CHECKPOINT_FSYNC_EVERY = 50
+
+# Async request throttling (override with OPENAI_MAX_CONCURRENT / OPENAI_MAX_TOKENS_PER_MINUTE)
+DEFAULT_MAX_CONCURRENT = 20
+DEFAULT_MAX_TOKENS_PER_MINUTE = 200_000
+
+
+class _JsonlCheckpoint:
+    """
+    Append-only JSONL log of movies finished by batch_generate_search_terms.
+    
+    Each line is {"movie_id": ..., "terms": {...}}. Appends are fsynced every
+    CHECKPOINT_FSYNC_EVERY records (and on close) to bound loss after a crash.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._unsynced = 0
+    
+    def load(self) -> Dict:
+        """Search terms already recorded, by movie_id (torn or malformed lines are skipped)"""
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json_loads(line)
+                    done[record['movie_id']] = record['terms']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        return done
+    
+    def append(self, movie_id, search_terms: Dict[str, List[str]]):
+        self._file.write(json_dumps({'movie_id': movie_id, 'terms': search_terms}) + b'\n')
+        self._unsynced += 1
+        if self._unsynced >= CHECKPOINT_FSYNC_EVERY:
+            self._sync()
+    
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+    
+    def __enter__(self) -> '_JsonlCheckpoint':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'ab+')
+        # Terminate a torn last line so the next record starts on its own line
+        if self._file.seek(0, os.SEEK_END) > 0:
+            self._file.seek(-1, os.SEEK_END)
+            if self._file.read(1) != b'\n':
+                self._file.write(b'\n')
+        return self
+    
+    def __exit__(self, *exc):
+        self._sync()
+        self._file.close()
+        self._file = None
+
+
+class SearchTerms(BaseModel):
+    """Expected structure of generated search terms (one list per platform)"""
+    reddit: List[str]
+    twitter: List[str]
+    imdb: List[str]
+    general: List[str]
+    
+    @field_validator('reddit', 'twitter', 'imdb', 'general')
+    @classmethod
+    def _term_count(cls, terms: List[str]) -> List[str]:
+        """Require MIN_TERMS terms; extras beyond MAX_TERMS are dropped (the best come first)"""
+        if len(terms) < MIN_TERMS:
+            raise ValueError(f"expected at least {MIN_TERMS} terms, got {len(terms)}")
+        return terms[:MAX_TERMS]
+
 
 class GeminiSearchTermGenerator:
-    """Generate optimized search terms for scraping using OpenAI API"""
+    """
+    Generate optimized search terms for scraping using OpenAI API.
+    
+    Synchronous requests share one client (and its keep-alive connection pool)
+    per API key across all instances; still, create one generator and reuse it.
+    """
+    
+    _clients: Dict[str, OpenAI] = {}
+    
+    # Prompts are built once; only the movie context is filled in per request
+    _SYSTEM_MSG = "You are a helpful assistant that generates search terms for movies. Always respond with valid JSON."
+    _MESSAGES_PREFIX = ({"role": "system", "content": _SYSTEM_MSG},)
+    
+    _PROMPT_TEMPLATE = """You are a search optimization expert. Generate optimal search terms for finding movie discussions and reviews.
+
+Movie Information:
+{context}
+
+Guidelines (3-5 terms per platform, best first):
+- REDDIT: Discussion-style phrases, include title variations
+- TWITTER: Hashtags with # symbol, no spaces in hashtags
+- IMDB: Official title with year, title variations
+- GENERAL: Universal search terms, abbreviations, genre+title"""
     
-    def __init__(self, api_key: str = None):
+    _BATCH_PROMPT_TEMPLATE = """You are a search optimization expert. Generate optimal search terms for finding movie discussions and reviews for EACH movie below.
+
+Movies:
+{context}
+
+Return one entry per movie in "results", keyed by the movie's number.
+
+Guidelines (3-5 terms per platform, best first):
+- REDDIT: Discussion-style phrases, include title variations
+- TWITTER: Hashtags with # symbol, no spaces in hashtags
+- IMDB: Official title with year, title variations
+- GENERAL: Universal search terms, abbreviations, genre+title"""
+    
+    # Structured outputs: the API guarantees responses match this schema. Strict mode
+    # may reject minItems/maxItems, so term counts are left to the prompt and SearchTerms
+    _TERM_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+    _SCHEMA = {
+        "type": "object",
+        "properties": {
+            "reddit": _TERM_LIST_SCHEMA,
+            "twitter": _TERM_LIST_SCHEMA,
+            "imdb": _TERM_LIST_SCHEMA,
+            "general": _TERM_LIST_SCHEMA
+        },
+        "required": ["reddit", "twitter", "imdb", "general"],
+        "additionalProperties": False
+    }
+    
+    def __init__(
+        self,
+        api_key: str = None,
+        max_concurrent: int = None,
+        max_tokens_per_minute: int = None,
+        cache_dir: Optional[Path] = SEARCH_TERMS_CACHE_DIR
+    ):
         """
         Initialize OpenAI client.
         
         Args:
             api_key: OpenAI API key (if None, loads from .env or config)
+            max_concurrent: Max in-flight async requests (defaults to
+                OPENAI_MAX_CONCURRENT or 20)
+            max_tokens_per_minute: Token budget for async requests (defaults to
+                OPENAI_MAX_TOKENS_PER_MINUTE or 200,000)
+            cache_dir: Directory for cached search terms (None disables the cache)
         """
         if api_key is None:
-            api_key = self._load_api_key()
+            api_key = _load_api_key()
         
-        self.client = OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self.client = self._get_client(api_key)
+        self.async_client = None  # Created per event loop (see _bind_loop)
         # Use GPT-4o-mini for cost-effective search term generation
         self.model = "gpt-4o-mini"
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        
+        # Stay under the account's rate limits instead of retrying 429s
+        self.max_concurrent = max_concurrent or int(
+            os.getenv('OPENAI_MAX_CONCURRENT', DEFAULT_MAX_CONCURRENT)
+        )
+        self.max_tokens_per_minute = max_tokens_per_minute or int(
+            os.getenv('OPENAI_MAX_TOKENS_PER_MINUTE', DEFAULT_MAX_TOKENS_PER_MINUTE)
+        )
+        self._sem = None
+        self._loop = None
+        self._token_log = deque()  # (timestamp, tokens) within the last minute
+        self._tokens_in_window = 0
         logger.info("OpenAI API initialized successfully")
     
-    def _load_api_key(self) -> str:
-        """Load API key from .env file or config file"""
-        # First try loading from .env file
-        env_path = Path(__file__).parent.parent.parent / '.env'
-        if env_path.exists():
-            load_dotenv(env_path)
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                logger.info("Loaded OpenAI API key from .env file")
-                return api_key
-        
-        # Fall back to config file
-        config_path = Path(__file__).parent.parent.parent / 'config' / 'api_keys.yaml'
-        try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                api_key = config.get('openai', {}).get('api_key')
-                if api_key:
-                    logger.info("Loaded OpenAI API key from config file")
-                    return api_key
-        except Exception as e:
-            logger.warning(f"Could not load from config: {e}")
-        
-        raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in .env file or config/api_keys.yaml")
+    @classmethod
+    def _get_client(cls, api_key: str) -> OpenAI:
+        """Shared OpenAI client for an API key (created on first use)"""
+        client = cls._clients.get(api_key)
+        if client is None:
+            # Retries are handled by retry_transient, not the client
+            client = OpenAI(api_key=api_key, max_retries=0, timeout=REQUEST_TIMEOUT)
+            cls._clients[api_key] = client
+        return client
     
     def generate_search_terms(
         self, 
@@ -85,112 +314,513 @@ class GeminiSearchTermGenerator:
                 'general': [...]
             }
         """
+        cache_path = self._cache_path(title, year, genres, overview)
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            return cached
+        
         try:
-            # Build context for OpenAI
-            context = f"Movie: {title}"
-            if year:
-                context += f" ({year})"
-            if genres:
-                context += f"\nGenres: {', '.join(genres)}"
-            if overview:
-                context += f"\nPlot: {overview[:200]}"  # Limit length
+            response_text, _ = self._call_api(self._request_kwargs(title, year, genres, overview))
+            search_terms = self._parse_search_terms(response_text, title)
+            self._save_cached(cache_path, search_terms)
+            return search_terms
             
-            # Create prompt with strict JSON format requirement
-            prompt = f"""You are a search optimization expert. Generate optimal search terms for finding movie discussions and reviews.
-
-Movie Information:
-{context}
-
-Generate search terms in these EXACT categories. Return ONLY valid JSON, no markdown, no explanations.
-
-Return a JSON object with this EXACT structure:
-{{
-  "reddit": ["term1", "term2", "term3", "term4", "term5"],
-  "twitter": ["#Term1", "#Term2", "#Term3", "#Term4", "#Term5"],
-  "imdb": ["term with year", "term variation", "term"],
-  "general": ["term1", "term2", "term3", "term4", "term5"]
-}}
-
-Guidelines:
-- REDDIT: Discussion-style phrases, include title variations
-- TWITTER: Hashtags with # symbol, no spaces in hashtags
-- IMDB: Official title with year, title variations
-- GENERAL: Universal search terms, abbreviations, genre+title
-
-Return pure JSON only. No markdown code blocks. No explanations. Just the JSON object."""
+        except Exception as e:
+            logger.error("Error generating search terms for '%s': %s", title, e)
+            return None
+    
+    async def _agenerate_search_terms(
+        self, 
+        title: str, 
+        year: int = None, 
+        genres: List[str] = None,
+        overview: str = None
+    ) -> Optional[Dict[str, List[str]]]:
+        """Async version of generate_search_terms (uses the AsyncOpenAI client)"""
+        cache_path = self._cache_path(title, year, genres, overview)
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            return cached
+        
+        try:
+            response_text = await self._athrottled_call(self._request_kwargs(title, year, genres, overview))
+            search_terms = self._parse_search_terms(response_text, title)
+            self._save_cached(cache_path, search_terms)
+            return search_terms
             
-            # Call OpenAI API with JSON mode
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that generates search terms for movies. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-                max_tokens=500
+        except Exception as e:
+            logger.error("Error generating search terms for '%s': %s", title, e)
+            return None
+    
+    def generate_search_terms_batch(self, movies: List[Dict]) -> List[Optional[Dict[str, List[str]]]]:
+        """
+        Generate search terms for several movies with a single API request.
+        
+        Movies the combined response leaves out or gets wrong are retried
+        with one request each.
+        
+        Args:
+            movies: List of movie dictionaries with keys: title, year, genres, overview
+        
+        Returns:
+            Search terms (or None) for each movie, in order
+        """
+        results, pending = self._batch_cache_lookup(movies)
+        
+        if len(pending) > 1:
+            try:
+                response_text, _ = self._call_api(self._batch_request_kwargs([movies[i] for i in pending]))
+                pending = self._fill_batch_results(response_text, movies, pending, results)
+            except Exception as e:
+                logger.error("Batched search term request failed, retrying per movie: %s", e)
+        
+        for i in pending:
+            results[i] = self.generate_search_terms(*self._movie_args(movies[i]))
+        
+        return results
+    
+    async def _agenerate_search_terms_batch(self, movies: List[Dict]) -> List[Optional[Dict[str, List[str]]]]:
+        """Async version of generate_search_terms_batch"""
+        results, pending = self._batch_cache_lookup(movies)
+        
+        if len(pending) > 1:
+            try:
+                response_text = await self._athrottled_call(
+                    self._batch_request_kwargs([movies[i] for i in pending])
+                )
+                pending = self._fill_batch_results(response_text, movies, pending, results)
+            except Exception as e:
+                logger.error("Batched search term request failed, retrying per movie: %s", e)
+        
+        retried = await asyncio.gather(
+            *(self._agenerate_search_terms(*self._movie_args(movies[i])) for i in pending)
+        )
+        for i, search_terms in zip(pending, retried):
+            results[i] = search_terms
+        
+        return results
+    
+    @staticmethod
+    def _movie_args(movie: Dict) -> tuple:
+        """(title, year, genres, overview) from a movie dictionary"""
+        return movie.get('title'), movie.get('year'), movie.get('genres', []), movie.get('overview')
+    
+    def _batch_cache_lookup(self, movies: List[Dict]):
+        """
+        Resolve cached movies up front.
+        
+        Returns:
+            Tuple of (results list with cached entries filled in, indices still to generate)
+        """
+        results = [self._load_cached(self._cache_path(*self._movie_args(movie))) for movie in movies]
+        pending = [i for i, search_terms in enumerate(results) if search_terms is None]
+        return results, pending
+    
+    def _fill_batch_results(
+        self,
+        response_text: str,
+        movies: List[Dict],
+        pending: List[int],
+        results: List[Optional[Dict[str, List[str]]]]
+    ) -> List[int]:
+        """
+        Fan a batched response out into results (and the cache).
+        
+        Each movie's entry is validated on its own, so one bad entry does not
+        discard the rest.
+        
+        Returns:
+            Indices of movies that still need a per-movie request
+        """
+        try:
+            batch_terms = json_loads(response_text).get('results')
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.error("Could not parse batched search terms: %s", e)
+            return pending
+        if not isinstance(batch_terms, dict):
+            logger.error("Batched search term response has no 'results' object")
+            return pending
+        
+        missing = []
+        for number, i in enumerate(pending, start=1):
+            title = movies[i].get('title')
+            search_terms = self._validate_search_terms(batch_terms.get(str(number)), title)
+            if search_terms is None:
+                missing.append(i)
+                continue
+            results[i] = search_terms
+            self._save_cached(self._cache_path(*self._movie_args(movies[i])), search_terms)
+        
+        return missing
+    
+    def _cache_path(
+        self, 
+        title: str, 
+        year: int = None, 
+        genres: List[str] = None,
+        overview: str = None
+    ) -> Optional[Path]:
+        """Cache file for a movie, keyed by its inputs, the model and the prompt version"""
+        if self.cache_dir is None:
+            return None
+        key = json.dumps(
+            [title, year, sorted(genres or []), overview, self.model, PROMPT_VERSION],
+            sort_keys=True
+        )
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+    
+    def _load_cached(self, cache_path: Optional[Path]) -> Optional[Dict[str, List[str]]]:
+        """Cached search terms, or None on a miss"""
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            return json_loads(cache_path.read_bytes())
+        except Exception as e:
+            logger.warning("Ignoring unreadable search term cache %s: %s", cache_path, e)
+            return None
+    
+    def _save_cached(self, cache_path: Optional[Path], search_terms: Optional[Dict[str, List[str]]]):
+        """Write search terms to the cache (failed generations are not cached)"""
+        if cache_path is None or search_terms is None:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp_path.write_bytes(json_dumps(search_terms))
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning("Could not cache search terms: %s", e)
+    
+    @retry_transient
+    def _call_api(self, request: Dict) -> Tuple[str, Optional[int]]:
+        """
+        Stream a chat completion, retried on transient errors.
+        
+        Returns:
+            Tuple of (response text, total tokens used or None)
+        """
+        stream = self.client.chat.completions.create(
+            **request, stream=True, stream_options={"include_usage": True}
+        )
+        chunks = []
+        total_tokens = None
+        for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                chunks.append(event.choices[0].delta.content)
+            if event.usage is not None:
+                total_tokens = event.usage.total_tokens
+        return "".join(chunks).strip(), total_tokens
+    
+    @retry_transient
+    async def _acall_api(self, request: Dict) -> Tuple[str, Optional[int]]:
+        """
+        Async version of _call_api, under the concurrency limit.
+        
+        Each attempt takes its own slot, so a retry backing off does not
+        hold one while it sleeps.
+        """
+        async with self._bind_loop():
+            stream = await self.async_client.chat.completions.create(
+                **request, stream=True, stream_options={"include_usage": True}
             )
+            chunks = []
+            total_tokens = None
+            async for event in stream:
+                if event.choices and event.choices[0].delta.content:
+                    chunks.append(event.choices[0].delta.content)
+                if event.usage is not None:
+                    total_tokens = event.usage.total_tokens
+        return "".join(chunks).strip(), total_tokens
+    
+    async def _athrottled_call(self, request: Dict) -> str:
+        """_acall_api under the tokens-per-minute budget (claimed once, not per retry); returns the response text"""
+        # Prompt tokens plus the completion cap
+        estimated_tokens = self._count_tokens(request['messages'][-1]['content']) + request['max_tokens']
+        
+        await self._reserve_tokens(estimated_tokens)
+        response_text, total_tokens = await self._acall_api(request)
+        
+        if total_tokens is not None:
+            self._record_tokens(total_tokens - estimated_tokens)
+        return response_text
+    
+    def _bind_loop(self) -> asyncio.Semaphore:
+        """
+        Set up the async client and concurrency limiter for the running event loop.
+        
+        Each asyncio.run from the sync wrapper starts a new loop, and neither
+        semaphores nor pooled async connections can be reused across loops.
+        
+        Returns:
+            Semaphore limiting in-flight requests
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+            self.async_client = AsyncOpenAI(
+                api_key=self._api_key, max_retries=0, timeout=REQUEST_TIMEOUT
+            )
+            self._loop = loop
+        return self._sem
+    
+    def _record_tokens(self, tokens: int):
+        """Add tokens to the rolling one-minute window (negative to correct an estimate)"""
+        self._token_log.append((time.monotonic(), tokens))
+        self._tokens_in_window += tokens
+    
+    async def _reserve_tokens(self, tokens: int):
+        """Wait until the rolling one-minute window has room for tokens, then claim them"""
+        while True:
+            now = time.monotonic()
+            while self._token_log and now - self._token_log[0][0] >= 60:
+                self._tokens_in_window -= self._token_log.popleft()[1]
             
-            # Parse response
-            response_text = response.choices[0].message.content.strip()
-            
-            # Try to parse JSON
-            try:
-                search_terms = json.loads(response_text)
-                
-                # Validate structure
-                required_keys = ['reddit', 'twitter', 'imdb', 'general']
-                if not all(key in search_terms for key in required_keys):
-                    logger.error(f"Missing required keys in response for '{title}'")
-                    return None
-                
-                # Ensure all values are lists
-                for key in required_keys:
-                    if not isinstance(search_terms[key], list):
-                        logger.error(f"Invalid value type for key '{key}' in response for '{title}'")
-                        return None
-                
-                logger.info(f"Generated search terms for '{title}'")
-                return search_terms
-                
-            except json.JSONDecodeError as json_err:
-                logger.error(f"JSON parse error for '{title}': {json_err}")
-                return None
+            if not self._token_log or self._tokens_in_window + tokens <= self.max_tokens_per_minute:
+                self._record_tokens(tokens)
+                return
             
-        except Exception as e:
-            logger.error(f"Error generating search terms for '{title}': {e}")
+            await asyncio.sleep(60 - (now - self._token_log[0][0]))
+    
+    def _count_tokens(self, text: str) -> int:
+        """Token count of text for self.model (~4 characters per token without tiktoken)"""
+        encoding = _get_encoding(self.model)
+        if encoding is None:
+            return len(text) // 4
+        return len(encoding.encode(text))
+    
+    def _truncate_tokens(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens, never splitting a UTF-8 character"""
+        encoding = _get_encoding(self.model)
+        if encoding is None:
+            return text[:max_tokens * 4]
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode_bytes(tokens[:max_tokens]).decode('utf-8', errors='ignore')
+    
+    def _movie_context(
+        self,
+        title: str, 
+        year: int = None, 
+        genres: List[str] = None,
+        overview: str = None
+    ) -> str:
+        """Movie details as given to the model"""
+        context = f"Movie: {title}"
+        if year:
+            context += f" ({year})"
+        if genres:
+            context += f"\nGenres: {', '.join(genres)}"
+        if overview:
+            context += f"\nPlot: {self._truncate_tokens(overview, OVERVIEW_MAX_TOKENS)}"  # Limit length
+        return context
+    
+    def _request_kwargs(
+        self, 
+        title: str, 
+        year: int = None, 
+        genres: List[str] = None,
+        overview: str = None
+    ) -> Dict:
+        """Build the chat.completions.create arguments for one movie"""
+        # Build context for OpenAI
+        context = self._movie_context(title, year, genres, overview)
+        
+        prompt = self._PROMPT_TEMPLATE.format(context=context)
+        
+        # OpenAI API call with structured outputs
+        return dict(
+            model=self.model,
+            messages=[*self._MESSAGES_PREFIX, {"role": "user", "content": prompt}],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "search_terms", "schema": self._SCHEMA, "strict": True}
+            },
+            temperature=0.7,
+            max_tokens=500
+        )
+    
+    def _batch_request_kwargs(self, movies: List[Dict]) -> Dict:
+        """Build the chat.completions.create arguments for several movies (numbered from 1)"""
+        context = "\n\n".join(
+            f"[{number}] {self._movie_context(*self._movie_args(movie))}"
+            for number, movie in enumerate(movies, start=1)
+        )
+        
+        prompt = self._BATCH_PROMPT_TEMPLATE.format(context=context)
+        
+        return dict(
+            model=self.model,
+            messages=[*self._MESSAGES_PREFIX, {"role": "user", "content": prompt}],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "batch_search_terms", "schema": self._batch_schema(len(movies)), "strict": True}
+            },
+            temperature=0.7,
+            max_tokens=500 * len(movies)
+        )
+    
+    @classmethod
+    def _batch_schema(cls, n_movies: int) -> Dict:
+        """Schema for a batched response: {"results": {"1": <_SCHEMA>, ..., "<n_movies>": <_SCHEMA>}}"""
+        numbers = [str(number) for number in range(1, n_movies + 1)]
+        results = {
+            "type": "object",
+            "properties": {number: cls._SCHEMA for number in numbers},
+            "required": numbers,
+            "additionalProperties": False
+        }
+        return {
+            "type": "object",
+            "properties": {"results": results},
+            "required": ["results"],
+            "additionalProperties": False
+        }
+    
+    def _parse_search_terms(self, response_text: str, title: str) -> Optional[Dict[str, List[str]]]:
+        """Parse and validate a response into search terms (None if invalid)"""
+        # Try to parse JSON
+        try:
+            search_terms = json_loads(response_text)
+        except json.JSONDecodeError as json_err:
+            logger.error("JSON parse error for '%s': %s", title, json_err)
+            return None
+        
+        return self._validate_search_terms(search_terms, title)
+    
+    def _validate_search_terms(self, search_terms, title: str) -> Optional[Dict[str, List[str]]]:
+        """Check parsed search terms match SearchTerms (None if not)"""
+        try:
+            validated = SearchTerms.model_validate(search_terms)
+        except ValidationError as e:
+            problems = "; ".join(
+                f"{'.'.join(map(str, err['loc'])) or 'response'}: {err['msg']}" for err in e.errors()
+            )
+            logger.error("Invalid search terms in response for '%s': %s", title, problems)
             return None
+        
+        logger.info("Generated search terms for '%s'", title)
+        return validated.model_dump()
     
     def batch_generate_search_terms(
         self, 
-        movies: List[Dict]
+        movies: List[Dict],
+        batch_size: int = 5,
+        checkpoint_path: Optional[Path] = None
     ) -> Dict[int, Dict[str, List[str]]]:
         """
         Generate search terms for multiple movies.
         
+        Movies are sent batch_size per request, and requests run concurrently.
+        
         Args:
             movies: List of movie dictionaries with keys: id, title, year, genres, overview
+            batch_size: Movies per API request (1 sends one request per movie)
+            checkpoint_path: JSONL file recording finished movies; movies already
+                in it are skipped, so an interrupted batch can be resumed
         
         Returns:
             Dictionary mapping movie_id to search terms
         """
-        results = {}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.abatch_generate_search_terms(movies, batch_size, checkpoint_path))
         
-        for movie in movies:
-            movie_id = movie.get('id')
-            title = movie.get('title')
-            year = movie.get('year')
-            genres = movie.get('genres', [])
-            overview = movie.get('overview')
-            
-            try:
-                search_terms = self.generate_search_terms(title, year, genres, overview)
-                results[movie_id] = search_terms
-            except Exception as e:
-                logger.error(f"Failed to generate search terms for movie {movie_id}: {e}")
-                continue
+        # Already inside an event loop (e.g. Jupyter): asyncio.run is not allowed,
+        # so fall back to one request at a time
+        checkpoint, results, remaining = self._resume(movies, checkpoint_path)
         
-        return results
+        with checkpoint or nullcontext():
+            for start in range(0, len(remaining), batch_size):
+                chunk = remaining[start:start + batch_size]
+                
+                try:
+                    search_terms = self.generate_search_terms_batch(chunk)
+                except Exception as e:
+                    logger.error("Failed to generate search terms for movies %s: %s", [m.get('id') for m in chunk], e)
+                    continue
+                
+                self._record_chunk(chunk, search_terms, results, checkpoint)
+        
+        return self._in_input_order(movies, results)
+    
+    async def abatch_generate_search_terms(
+        self, 
+        movies: List[Dict],
+        batch_size: int = 5,
+        checkpoint_path: Optional[Path] = None
+    ) -> Dict[int, Dict[str, List[str]]]:
+        """
+        Async version of batch_generate_search_terms: all requests are awaited together.
+        
+        Args:
+            movies: List of movie dictionaries with keys: id, title, year, genres, overview
+            batch_size: Movies per API request (1 sends one request per movie)
+            checkpoint_path: JSONL file recording finished movies (see batch_generate_search_terms)
+        
+        Returns:
+            Dictionary mapping movie_id to search terms
+        """
+        checkpoint, results, remaining = self._resume(movies, checkpoint_path)
+        chunks = [remaining[start:start + batch_size] for start in range(0, len(remaining), batch_size)]
+        
+        async def run_chunk(chunk: List[Dict]):
+            search_terms = await self._agenerate_search_terms_batch(chunk)
+            # Record each chunk as soon as it finishes so a crash loses little
+            self._record_chunk(chunk, search_terms, results, checkpoint)
+        
+        with checkpoint or nullcontext():
+            outcomes = await asyncio.gather(
+                *(run_chunk(chunk) for chunk in chunks),
+                return_exceptions=True
+            )
+        
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Failed to generate search terms for movies %s: %s", [m.get('id') for m in chunk], outcome)
+        
+        return self._in_input_order(movies, results)
+    
+    @staticmethod
+    def _resume(movies: List[Dict], checkpoint_path: Optional[Path]):
+        """
+        Open the batch checkpoint (if any) and drop movies it already covers.
+        
+        Returns:
+            Tuple of (checkpoint or None, results so far by movie_id, movies still to generate)
+        """
+        if checkpoint_path is None:
+            return None, {}, movies
+        
+        checkpoint = _JsonlCheckpoint(checkpoint_path)
+        results = checkpoint.load()
+        remaining = [movie for movie in movies if movie.get('id') not in results]
+        if len(remaining) < len(movies):
+            logger.info("Resuming from checkpoint: %d movies already done", len(movies) - len(remaining))
+        return checkpoint, results, remaining
+    
+    @staticmethod
+    def _record_chunk(
+        chunk: List[Dict],
+        search_terms: List[Optional[Dict[str, List[str]]]],
+        results: Dict,
+        checkpoint: Optional[_JsonlCheckpoint]
+    ):
+        """Store a finished chunk in results, checkpointing the successful movies"""
+        for movie, terms in zip(chunk, search_terms):
+            results[movie.get('id')] = terms
+            if checkpoint is not None and terms is not None:
+                checkpoint.append(movie.get('id'), terms)
+    
+    @staticmethod
+    def _in_input_order(movies: List[Dict], results: Dict) -> Dict[int, Dict[str, List[str]]]:
+        """Results restricted to the requested movies, in input order"""
+        return {
+            movie.get('id'): results[movie.get('id')]
+            for movie in movies if movie.get('id') in results
+        }
 
 
 # Example usage
@@ -2,40 +2,101 @@
 IMDb scraper - Highest priority source for quality reviews.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import calendar
+import io
+import itertools
+import math
 import time
+from lxml import etree, html as lxml_html
 import re
 from datetime import datetime
-from typing import List, Dict, Optional
-import sys
 from pathlib import Path
+from typing import Iterable, List, Dict, Optional, Tuple, Union
+from urllib.parse import quote
 
-sys.path.append(str(Path(__file__).parent.parent))
 from utils.logger import setup_logger
+from utils.rate_limit import TokenBucket
+from utils.scraping import ShelfCache, arun_many, aretrying_request, json_loads, run_many, shared_session
+from utils.xpath import class_step
+
+# Optional: concurrent scraping of many movies (scrape_many_movie_reviews)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Optional: brotli-compressed responses (requests/urllib3 and aiohttp decode them when installed)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 logger = setup_logger(__name__)
 
+# Persistent title -> IMDb ID cache (shelve adds its own file extension)
+IMDB_SEARCH_CACHE_PATH = Path.home() / '.cache' / 'hybrid-rec-sys' / 'imdb_search'
+# Ratings drift, so they are only reused for a day
+RATING_CACHE_TTL = 24 * 3600
+
+# Patterns used on every search result and review
+_RE_TT = re.compile(r'/(tt\d+)/')
+_RE_TITLE_HREF = re.compile(r'/title/tt\d+/')
+_RE_HELPFUL = re.compile(r'(\d+)\s+out of')
+
+# JSON-LD aggregateRating object, matched on the raw page bytes
+_RE_AGGR = re.compile(rb'"aggregateRating"\s*:\s*(\{[^}]*\})')
+
+# Month name -> number, for parsing review dates without strptime
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+
 
 class IMDbScraper:
     """Scrape reviews from IMDb"""
     
     BASE_URL = "https://www.imdb.com"
+    # Lightweight JSON title search (used before falling back to the /find HTML page)
+    SUGGESTION_URL = "https://v3.sg.media-imdb.com/suggestion/titles/x/{query}.json"
+    SUGGESTION_TYPES = ('movie', 'tvMovie')
     HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
         'Accept-Language': 'en-US,en;q=0.9',
+        # Only advertise br when it can be decoded
+        'Accept-Encoding': 'br, gzip' if BROTLI_AVAILABLE else 'gzip',
     }
+    # Pages are parsed with lxml directly; each lookup is one compiled XPath evaluated in C
+    HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+    XP_SEARCH_LINKS = etree.XPath('//a[contains(@href, "/tt")]')
+    XP_JSON_LD = etree.XPath('//script[@type="application/ld+json"]')
+    XP_TITLE = etree.XPath('.//' + class_step('a', 'title'))
+    XP_TEXT = etree.XPath('.//div[@class="text show-more__control"]')
+    XP_CONTENT = etree.XPath('.//' + class_step('div', 'content'))
+    XP_RATING = etree.XPath('.//' + class_step('span', 'rating-other-user-rating'))
+    XP_AUTHOR = etree.XPath('.//' + class_step('span', 'display-name-link'))
+    XP_DATE = etree.XPath('.//' + class_step('span', 'review-date'))
+    XP_HELPFUL = etree.XPath('.//div[@class="actions text-muted"]')
     
-    def __init__(self, rate_limit: float = 2.0):
+    def __init__(self, rate_limit: float = 2.0, search_cache: Optional[Path] = IMDB_SEARCH_CACHE_PATH):
         """
         Initialize IMDb scraper.
         
         Args:
-            rate_limit: Seconds between requests
+            rate_limit: Average seconds between requests
+            search_cache: Path of the on-disk search cache (None keeps results in memory only)
         """
         self.rate_limit = rate_limit
-        self.session = requests.Session()
-        self.session.headers.update(self.HEADERS)
+        # Found IMDb IDs keyed by (title, year); the shelf is opened on first use
+        self._search_cache = ShelfCache(search_cache, 'IMDb search cache')
+        # imdb_id -> (monotonic time scraped, rating dict)
+        self._rating_cache: Dict[str, Tuple[float, Dict]] = {}
+        # Requests only wait when they would exceed the average rate (bursts of ~2s allowed)
+        self._bucket = TokenBucket(
+            rate=1 / rate_limit if rate_limit > 0 else math.inf,
+            capacity=max(1, int(2 / rate_limit)) if rate_limit > 0 else 1
+        )
+        # HTTP session shared by all IMDb scrapers, so instances reuse its open connections
+        self.session = shared_session('imdb', self.HEADERS)
     
     def search_movie(self, title: str, year: Optional[int] = None) -> Optional[str]:
         """
@@ -48,58 +109,126 @@ class IMDbScraper:
         Returns:
             IMDb ID (e.g., 'tt1375666') or None
         """
+        key = self._search_key(title, year)
+        imdb_id = self._search_cache.get(key)
+        if imdb_id:
+            return imdb_id
+        
+        imdb_id = self._search_movie_uncached(title, year)
+        if imdb_id:
+            self._search_cache.set(key, imdb_id)
+        return imdb_id
+    
+    def _search_movie_uncached(self, title: str, year: Optional[int] = None) -> Optional[str]:
+        """Look up an IMDb ID over the network (suggestion API, then /find)"""
         try:
-            search_query = title
-            if year:
-                search_query += f" {year}"
-            
-            search_url = f"{self.BASE_URL}/find"
-            params = {'q': search_query, 's': 'tt', 'ttype': 'ft'}
-            
-            time.sleep(self.rate_limit)
-            response = self.session.get(search_url, params=params, timeout=30)
+            self._bucket.acquire()
+            response = self.session.get(self._suggestion_url(title), timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try multiple selectors for IMDb's dynamic structure
-            # Method 1: Look for data-testid attribute (new IMDb)
-            result = soup.find('a', {'data-testid': 'search-result-title'})
-            if result and 'href' in result.attrs:
-                href = result['href']
-                match = re.search(r'/(tt\d+)/', href)
-                if match:
-                    imdb_id = match.group(1)
-                    logger.info(f"Found IMDb ID for '{title}': {imdb_id}")
-                    return imdb_id
-            
-            # Method 2: Look for ipc-metadata-list-summary-item (new IMDb structure)
-            result = soup.find('a', class_=lambda x: x and 'ipc-metadata-list-summary-item__t' in x)
-            if result and 'href' in result.attrs:
-                href = result['href']
-                match = re.search(r'/(tt\d+)/', href)
-                if match:
-                    imdb_id = match.group(1)
-                    logger.info(f"Found IMDb ID for '{title}': {imdb_id}")
-                    return imdb_id
+            imdb_id = self._parse_suggestions(json_loads(response.content), year)
+            if imdb_id:
+                return imdb_id
+        except Exception as e:
+            logger.debug(f"IMDb suggestion lookup failed for '{title}': {e}")
+        
+        # Fall back to the full /find search page
+        try:
+            self._bucket.acquire()
+            response = self.session.get(
+                f"{self.BASE_URL}/find", params=self._search_params(title, year), timeout=30
+            )
+            response.raise_for_status()
             
-            # Method 3: Find any link with /title/tt pattern
-            all_links = soup.find_all('a', href=re.compile(r'/title/tt\d+/'))
-            if all_links:
-                href = all_links[0]['href']
-                match = re.search(r'/(tt\d+)/', href)
-                if match:
-                    imdb_id = match.group(1)
-                    logger.info(f"Found IMDb ID for '{title}': {imdb_id}")
-                    return imdb_id
-            
-            logger.warning(f"Could not find IMDb ID for '{title}'")
-            return None
+            return self._parse_search_results(response.content, title)
             
         except Exception as e:
             logger.error(f"Error searching IMDb for '{title}': {e}")
             return None
     
+    @staticmethod
+    def _search_key(title: str, year: Optional[int] = None) -> str:
+        """Cache key for a search"""
+        return f"{title.strip().lower()}|{year or ''}"
+    
+    def close(self):
+        """Close the on-disk search cache (the shared HTTP session stays open for other instances)"""
+        self._search_cache.close()
+    
+    def _suggestion_url(self, title: str) -> str:
+        """URL of IMDb's JSON suggestion endpoint for a title"""
+        return self.SUGGESTION_URL.format(query=quote(title.lower()))
+    
+    @classmethod
+    def _parse_suggestions(cls, data: Dict, year: Optional[int] = None) -> Optional[str]:
+        """
+        Pick a movie from an IMDb suggestion response.
+        
+        Args:
+            data: Decoded suggestion JSON
+            year: Release year (matches within one year either way)
+        
+        Returns:
+            IMDb ID of the first matching movie, or None
+        """
+        for entry in data.get('d', []):
+            if entry.get('qid') not in cls.SUGGESTION_TYPES:
+                continue
+            if year and (not entry.get('y') or abs(entry['y'] - year) > 1):
+                continue
+            if str(entry.get('id', '')).startswith('tt'):
+                return entry['id']
+        return None
+    
+    @staticmethod
+    def _search_params(title: str, year: Optional[int] = None) -> Dict:
+        """Query parameters for IMDb's /find page"""
+        search_query = title
+        if year:
+            search_query += f" {year}"
+        return {'q': search_query, 's': 'tt', 'ttype': 'ft'}
+    
+    def _parse_search_results(self, content: bytes, title: str) -> Optional[str]:
+        """
+        Extract the first title's IMDb ID from a /find results page.
+        
+        Args:
+            content: Raw HTML of the search page
+            title: Movie title (for logging)
+        
+        Returns:
+            IMDb ID or None
+        """
+        root = self._html_root(content)
+        if root is None:
+            logger.warning(f"Could not find IMDb ID for '{title}'")
+            return None
+        
+        # Try multiple selectors for IMDb's dynamic structure, in one pass over the title links:
+        # 1. data-testid attribute (new IMDb), 2. ipc-metadata-list-summary-item (new IMDb
+        # structure), 3. any link with /title/tt pattern
+        candidates = [None, None, None]
+        for link in self.XP_SEARCH_LINKS(root):
+            href = link.get('href') or ''
+            if not _RE_TT.search(href):
+                continue
+            if link.get('data-testid') == 'search-result-title':
+                candidates[0] = href
+                break  # Highest priority; nothing later can beat it
+            if candidates[1] is None and 'ipc-metadata-list-summary-item__t' in (link.get('class') or ''):
+                candidates[1] = href
+            if candidates[2] is None and _RE_TITLE_HREF.search(href):
+                candidates[2] = href
+        
+        href = next((c for c in candidates if c is not None), None)
+        if href:
+            imdb_id = _RE_TT.search(href).group(1)
+            logger.info(f"Found IMDb ID for '{title}': {imdb_id}")
+            return imdb_id
+        
+        logger.warning(f"Could not find IMDb ID for '{title}'")
+        return None
+    
     def scrape_reviews(
         self, 
         imdb_id: str, 
@@ -118,50 +247,20 @@ class IMDbScraper:
         reviews = []
         
         try:
-            # IMDb reviews URL
-            reviews_url = f"{self.BASE_URL}/title/{imdb_id}/reviews"
-            
             # Pagination key for loading more reviews
             pagination_key = None
             
             while len(reviews) < max_reviews:
-                # Build URL with pagination
-                if pagination_key:
-                    url = f"{reviews_url}/_ajax?paginationKey={pagination_key}"
-                else:
-                    url = reviews_url
-                
-                time.sleep(self.rate_limit)
-                
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find review containers
-                review_containers = soup.find_all('div', class_='review-container')
-                
-                if not review_containers:
-                    logger.info(f"No more reviews found for {imdb_id}")
-                    break
+                self._bucket.acquire()
                 
-                for container in review_containers:
-                    if len(reviews) >= max_reviews:
-                        break
+                # Streamed: reviews are parsed as the body arrives, and reading stops at max_reviews
+                with self.session.get(self._reviews_url(imdb_id, pagination_key), timeout=30, stream=True) as response:
+                    response.raise_for_status()
                     
-                    try:
-                        review = self._parse_review(container, imdb_id)
-                        if review:
-                            reviews.append(review)
-                    except Exception as e:
-                        logger.error(f"Error parsing review: {e}")
-                        continue
-                
-                # Find pagination key for next page
-                load_more = soup.find('div', class_='load-more-data')
-                if load_more and 'data-key' in load_more.attrs:
-                    pagination_key = load_more['data-key']
-                else:
+                    pagination_key = self._parse_review_page(
+                        response.iter_content(chunk_size=65536), imdb_id, reviews, max_reviews
+                    )
+                if pagination_key is None:
                     break  # No more pages
             
             logger.info(f"Scraped {len(reviews)} reviews from IMDb for {imdb_id}")
@@ -171,13 +270,103 @@ class IMDbScraper:
             logger.error(f"Error scraping reviews for {imdb_id}: {e}")
             return reviews
     
-    def _parse_review(self, container, imdb_id: str) -> Optional[Dict]:
+    def _reviews_url(self, imdb_id: str, pagination_key: Optional[str] = None) -> str:
+        """URL of a movie's first reviews page, or of the page after pagination_key"""
+        reviews_url = f"{self.BASE_URL}/title/{imdb_id}/reviews"
+        if pagination_key:
+            return f"{reviews_url}/_ajax?paginationKey={pagination_key}"
+        return reviews_url
+    
+    def _parse_review_page(
+        self,
+        content: Union[bytes, Iterable[bytes]],
+        imdb_id: str,
+        reviews: List[Dict],
+        max_reviews: int
+    ) -> Optional[str]:
+        """
+        Parse one page of reviews, appending to reviews (up to max_reviews).
+        
+        The page is fed to an incremental parser: each review container is
+        parsed as soon as it is complete and then cleared, so only one review
+        subtree is held in full, and the rest of the body is not read once
+        max_reviews is reached.
+        
+        Args:
+            content: Raw HTML of the reviews page, as bytes or an iterable of chunks
+                (e.g. response.iter_content())
+            imdb_id: IMDb ID
+            reviews: Reviews scraped so far (extended in place)
+            max_reviews: Maximum number of reviews to collect
+        
+        Returns:
+            Pagination key of the next page, or None if there is none
+        """
+        # Pages without any review container are rejected without parsing. A streamed
+        # page is checked once its first chunk turns out to be the whole body (the
+        # empty "no more reviews" pages are far smaller than a chunk)
+        chunks = iter((content,) if isinstance(content, bytes) else content)
+        first = next(chunks, b'')
+        second = next(chunks, None)
+        if second is None and b'review-container' not in first:
+            logger.info(f"No more reviews found for {imdb_id}")
+            return None
+        content = itertools.chain((first,) if second is None else (first, second), chunks)
+        
+        parser = etree.HTMLPullParser(events=('end',), tag='div', encoding='utf-8')
+        parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+        
+        # One timestamp per page rather than per review
+        scraped_at = datetime.utcnow()
+        found_containers = False
+        pagination_key = None
+        
+        for chunk in content:
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                classes = (element.get('class') or '').split()
+                
+                if 'review-container' in classes:
+                    found_containers = True
+                    if len(reviews) < max_reviews:
+                        try:
+                            review = self._parse_review(element, imdb_id, scraped_at)
+                            if review:
+                                reviews.append(review)
+                        except Exception as e:
+                            logger.error(f"Error parsing review: {e}")
+                    element.clear()
+                
+                # Pagination key for the next page
+                elif 'load-more-data' in classes and pagination_key is None:
+                    pagination_key = element.get('data-key')
+            
+            if len(reviews) >= max_reviews:
+                break  # Enough reviews; the rest of the page is never read
+        
+        if not found_containers:
+            logger.info(f"No more reviews found for {imdb_id}")
+            return None
+        return pagination_key
+    
+    def _html_root(self, content: bytes):
+        """Root element of an HTML page, or None for an empty body"""
+        return lxml_html.parse(io.BytesIO(content), parser=self.HTML_PARSER).getroot()
+    
+    @staticmethod
+    def _first(xpath: etree.XPath, element):
+        """First element matched by xpath under element, or None"""
+        found = xpath(element)
+        return found[0] if found else None
+    
+    def _parse_review(self, container, imdb_id: str, scraped_at: Optional[datetime] = None) -> Optional[Dict]:
         """
         Parse a single review container.
         
         Args:
-            container: BeautifulSoup review container
+            container: lxml review container element
             imdb_id: IMDb ID
+            scraped_at: Time the page was fetched (defaults to now)
         
         Returns:
             Review dictionary or None
@@ -186,52 +375,48 @@ class IMDbScraper:
             # Review ID
             review_id = container.get('data-review-id')
             
-            # Title
-            title_elem = container.find('a', class_='title')
-            title = title_elem.text.strip() if title_elem else None
-            
-            # Text content
-            content_elem = container.find('div', class_='text show-more__control')
-            if not content_elem:
-                content_elem = container.find('div', class_='content')
-            text = content_elem.text.strip() if content_elem else None
+            # Text content (checked first so skipped reviews extract nothing else)
+            content_elem = self._first(self.XP_TEXT, container)
+            if content_elem is None:
+                content_elem = self._first(self.XP_CONTENT, container)
+            text = content_elem.text_content().strip() if content_elem is not None else None
             
             if not text or len(text) < 20:
                 return None  # Skip very short reviews
             
+            # Title
+            title_elem = self._first(self.XP_TITLE, container)
+            title = title_elem.text_content().strip() if title_elem is not None else None
+            
             # Rating
             rating = None
-            rating_elem = container.find('span', class_='rating-other-user-rating')
-            if rating_elem:
-                rating_text = rating_elem.find('span')
-                if rating_text:
+            rating_elem = self._first(self.XP_RATING, container)
+            if rating_elem is not None:
+                rating_text = rating_elem.find('.//span')
+                if rating_text is not None:
                     try:
-                        rating = float(rating_text.text.strip()) 
+                        rating = float(rating_text.text_content().strip()) 
                     except:
                         pass
             
             # Author
             author = None
-            author_elem = container.find('span', class_='display-name-link')
-            if author_elem:
-                author = author_elem.text.strip()
+            author_elem = self._first(self.XP_AUTHOR, container)
+            if author_elem is not None:
+                author = author_elem.text_content().strip()
             
             # Date
             review_date = None
-            date_elem = container.find('span', class_='review-date')
-            if date_elem:
-                date_str = date_elem.text.strip()
-                try:
-                    review_date = datetime.strptime(date_str, '%d %B %Y')
-                except:
-                    pass
+            date_elem = self._first(self.XP_DATE, container)
+            if date_elem is not None:
+                review_date = self._parse_review_date(date_elem.text_content().strip())
             
             # Helpful votes
             helpful_count = 0
-            helpful_elem = container.find('div', class_='actions text-muted')
-            if helpful_elem:
-                helpful_text = helpful_elem.text
-                match = re.search(r'(\d+)\s+out of', helpful_text)
+            helpful_elem = self._first(self.XP_HELPFUL, container)
+            if helpful_elem is not None:
+                helpful_text = helpful_elem.text_content()
+                match = _RE_HELPFUL.search(helpful_text)
                 if match:
                     helpful_count = int(match.group(1))
             
@@ -247,13 +432,36 @@ class IMDbScraper:
                 'helpful_count': helpful_count,
                 'review_length': len(text),
                 'word_count': len(text.split()),
-                'scraped_at': datetime.utcnow()
+                'scraped_at': scraped_at or datetime.utcnow()
             }
             
         except Exception as e:
             logger.error(f"Error parsing review: {e}")
             return None
     
+    @staticmethod
+    def _parse_review_date(date_str: str) -> Optional[datetime]:
+        """
+        Parse an IMDb review date such as '16 July 2010'.
+        
+        The common 'day month year' form is split directly; anything else
+        goes through strptime.
+        
+        Args:
+            date_str: Date text from the review
+        
+        Returns:
+            datetime or None if the text is not a date
+        """
+        parts = date_str.split()
+        try:
+            if (len(parts) == 3 and parts[1].lower() in _MONTHS
+                    and len(parts[0]) <= 2 and len(parts[2]) == 4):
+                return datetime(int(parts[2]), _MONTHS[parts[1].lower()], int(parts[0]))
+            return datetime.strptime(date_str, '%d %B %Y')
+        except ValueError:
+            return None
+    
     def scrape_movie_rating(
         self,
         title: str,
@@ -282,48 +490,87 @@ class IMDbScraper:
                     logger.warning(f"IMDb ID not found for '{title}' ({year})")
                     return None
             
+            cached = self._cached_rating(imdb_id)
+            if cached:
+                return cached
+            
             # Fetch movie page
             movie_url = f"{self.BASE_URL}/title/{imdb_id}/"
-            time.sleep(self.rate_limit)
+            self._bucket.acquire()
             
             response = self.session.get(movie_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find rating - IMDb uses structured JSON-LD data
-            rating = None
-            vote_count = None
-            
-            # Use JSON-LD structured data (most reliable)
-            script_tags = soup.find_all('script', type='application/ld+json')
-            for script in script_tags:
-                try:
-                    import json
-                    data = json.loads(script.string)
-                    if isinstance(data, dict) and 'aggregateRating' in data:
-                        rating_data = data['aggregateRating']
-                        rating = float(rating_data.get('ratingValue', 0))
-                        vote_count = int(rating_data.get('ratingCount', 0))
-                        break
-                except:
-                    continue
-            
-            if rating:
-                logger.info(f"Scraped rating for {imdb_id}: {rating}/10 ({vote_count} votes)")
-                return {
-                    'rating': rating,
-                    'vote_count': vote_count,
-                    'imdb_id': imdb_id
-                }
-            else:
-                logger.warning(f"Could not find rating for {imdb_id}")
-                return None
+            return self._parse_rating(response.content, imdb_id)
                 
         except Exception as e:
             logger.error(f"Error scraping rating for '{title}': {e}")
             return None
     
+    def _cached_rating(self, imdb_id: str) -> Optional[Dict]:
+        """Copy of a rating scraped within RATING_CACHE_TTL, or None"""
+        entry = self._rating_cache.get(imdb_id)
+        if entry and time.monotonic() - entry[0] < RATING_CACHE_TTL:
+            return dict(entry[1])
+        return None
+    
+    def _parse_rating(self, content: bytes, imdb_id: str) -> Optional[Dict]:
+        """
+        Extract the aggregate rating from a movie page.
+        
+        Args:
+            content: Raw HTML of the movie page
+            imdb_id: IMDb ID
+        
+        Returns:
+            Rating dictionary (see scrape_movie_rating) or None
+        """
+        # Find rating - IMDb uses structured JSON-LD data
+        rating = None
+        vote_count = None
+        
+        # Fast path: pull the aggregateRating object straight out of the bytes
+        match = _RE_AGGR.search(content)
+        if match:
+            try:
+                rating_data = json_loads(match.group(1))
+                rating = float(rating_data.get('ratingValue', 0))
+                vote_count = int(rating_data.get('ratingCount', 0))
+            except (ValueError, TypeError):
+                rating = None
+        
+        # Use JSON-LD structured data (most reliable)
+        script_tags = []
+        if not rating:
+            root = self._html_root(content)
+            script_tags = self.XP_JSON_LD(root) if root is not None else []
+        for script in script_tags:
+            # Only decode the block that carries the rating
+            if not script.text or 'aggregateRating' not in script.text:
+                continue
+            try:
+                data = json_loads(script.text)
+                if isinstance(data, dict) and 'aggregateRating' in data:
+                    rating_data = data['aggregateRating']
+                    rating = float(rating_data.get('ratingValue', 0))
+                    vote_count = int(rating_data.get('ratingCount', 0))
+                    break
+            except:
+                continue
+        
+        if rating:
+            logger.info(f"Scraped rating for {imdb_id}: {rating}/10 ({vote_count} votes)")
+            result = {
+                'rating': rating,
+                'vote_count': vote_count,
+                'imdb_id': imdb_id
+            }
+            self._rating_cache[imdb_id] = (time.monotonic(), result)
+            return dict(result)
+        else:
+            logger.warning(f"Could not find rating for {imdb_id}")
+            return None
+    
     def scrape_movie_reviews(
         self, 
         title: str, 
@@ -350,6 +597,200 @@ class IMDbScraper:
                 return []
         
         return self.scrape_reviews(imdb_id, max_reviews)
+    
+    def scrape_many_movie_reviews(
+        self,
+        movies: List[Dict],
+        max_reviews: int = 50,
+        concurrency: int = 4
+    ) -> List[List[Dict]]:
+        """
+        Search + scrape reviews for many movies, several at a time.
+        
+        Uses aiohttp when it is installed and no event loop is running;
+        otherwise a thread pool sharing this scraper's session. Either way
+        the token bucket keeps the overall request rate.
+        
+        Args:
+            movies: List of movie dictionaries with keys: title, year, imdb_id (optional)
+            max_reviews: Maximum reviews to scrape per movie
+            concurrency: Movies scraped concurrently
+        
+        Returns:
+            List of review lists, aligned with movies
+        """
+        return run_many(
+            movies,
+            concurrency,
+            lambda session, movie: self.ascrape_movie_reviews(
+                session, movie.get('title'), movie.get('year'), movie.get('imdb_id'), max_reviews
+            ),
+            lambda movie: self.scrape_movie_reviews(
+                movie.get('title'), movie.get('year'), movie.get('imdb_id'), max_reviews
+            ),
+            self.HEADERS
+        )
+    
+    def scrape_many_movie_ratings(self, movies: List[Dict], concurrency: int = 4) -> List[Optional[Dict]]:
+        """
+        Scrape ratings for many movies, several at a time (see scrape_many_movie_reviews).
+        
+        Args:
+            movies: List of movie dictionaries with keys: title, year, imdb_id (optional)
+            concurrency: Movies scraped concurrently
+        
+        Returns:
+            List of rating dictionaries (or None), aligned with movies
+        """
+        return run_many(
+            movies,
+            concurrency,
+            lambda session, movie: self.ascrape_movie_rating(
+                session, movie.get('title'), movie.get('year'), movie.get('imdb_id')
+            ),
+            lambda movie: self.scrape_movie_rating(movie.get('title'), movie.get('year'), movie.get('imdb_id')),
+            self.HEADERS
+        )
+    
+    async def ascrape_many(
+        self,
+        movies: List[Dict],
+        max_reviews: int = 50,
+        concurrency: int = 4
+    ) -> List[List[Dict]]:
+        """
+        Async version of scrape_many_movie_reviews (requires aiohttp).
+        
+        Args:
+            movies: List of movie dictionaries with keys: title, year, imdb_id (optional)
+            max_reviews: Maximum reviews to scrape per movie
+            concurrency: Movies scraped concurrently
+        
+        Returns:
+            List of review lists, aligned with movies
+        """
+        return await arun_many(
+            movies,
+            concurrency,
+            lambda session, movie: self.ascrape_movie_reviews(
+                session, movie.get('title'), movie.get('year'), movie.get('imdb_id'), max_reviews
+            ),
+            self.HEADERS
+        )
+    
+    async def ascrape_movie_rating(
+        self,
+        session,
+        title: str,
+        year: Optional[int] = None,
+        imdb_id: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Async version of scrape_movie_rating over an aiohttp session.
+        
+        Args:
+            session: aiohttp.ClientSession
+            title: Movie title
+            year: Release year
+            imdb_id: IMDb ID (if known, skips search)
+        
+        Returns:
+            Rating dictionary or None
+        """
+        try:
+            if not imdb_id:
+                imdb_id = await self._asearch_movie(session, title, year)
+                if not imdb_id:
+                    logger.warning(f"IMDb ID not found for '{title}' ({year})")
+                    return None
+            
+            cached = self._cached_rating(imdb_id)
+            if cached:
+                return cached
+            
+            content = await self._afetch(session, f"{self.BASE_URL}/title/{imdb_id}/")
+            return self._parse_rating(content, imdb_id)
+            
+        except Exception as e:
+            logger.error(f"Error scraping rating for '{title}': {e}")
+            return None
+    
+    async def ascrape_movie_reviews(
+        self,
+        session,
+        title: str,
+        year: Optional[int] = None,
+        imdb_id: Optional[str] = None,
+        max_reviews: int = 50
+    ) -> List[Dict]:
+        """
+        Async version of scrape_movie_reviews over an aiohttp session.
+        
+        Args:
+            session: aiohttp.ClientSession
+            title: Movie title
+            year: Release year
+            imdb_id: IMDb ID (if known, skips search)
+            max_reviews: Maximum reviews to scrape
+        
+        Returns:
+            List of review dictionaries
+        """
+        if not imdb_id:
+            imdb_id = await self._asearch_movie(session, title, year)
+            if not imdb_id:
+                logger.warning(f"Cannot scrape reviews - IMDb ID not found for '{title}'")
+                return []
+        
+        reviews = []
+        
+        try:
+            pagination_key = None
+            
+            while len(reviews) < max_reviews:
+                content = await self._afetch(session, self._reviews_url(imdb_id, pagination_key))
+                pagination_key = self._parse_review_page(content, imdb_id, reviews, max_reviews)
+                if pagination_key is None:
+                    break  # No more pages
+            
+            logger.info(f"Scraped {len(reviews)} reviews from IMDb for {imdb_id}")
+            
+        except Exception as e:
+            logger.error(f"Error scraping reviews for {imdb_id}: {e}")
+        
+        return reviews
+    
+    async def _asearch_movie(self, session, title: str, year: Optional[int] = None) -> Optional[str]:
+        """Async version of search_movie (shares its cache; disk access runs off the event loop)"""
+        key = self._search_key(title, year)
+        imdb_id = await self._search_cache.aget(key)
+        if imdb_id:
+            return imdb_id
+        
+        try:
+            content = await self._afetch(session, self._suggestion_url(title))
+            imdb_id = self._parse_suggestions(json_loads(content), year)
+        except Exception as e:
+            logger.debug(f"IMDb suggestion lookup failed for '{title}': {e}")
+        if not imdb_id:
+            try:
+                content = await self._afetch(session, f"{self.BASE_URL}/find", self._search_params(title, year))
+                imdb_id = self._parse_search_results(content, title)
+            except Exception as e:
+                logger.error(f"Error searching IMDb for '{title}': {e}")
+        
+        if imdb_id:
+            await self._search_cache.aset(key, imdb_id)
+        return imdb_id
+    
+    async def _afetch(self, session, url: str, params: Optional[Dict] = None) -> bytes:
+        """GET url once the rate limiter allows it and return the body (transient failures are retried)"""
+        await self._bucket.aacquire()
+        async with aretrying_request(
+            session, 'GET', url, params=params, timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            response.raise_for_status()
+            return await response.read()
 
 
 # Example usage
@@ -3,14 +3,16 @@ Reddit scraper using PRAW (Python Reddit API Wrapper).
 """
 
 import praw
+import queue
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
-import sys
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
 from utils.logger import setup_logger
+from utils.scraping import ShelfCache
 
 logger = setup_logger(__name__)
 
@@ -32,7 +34,20 @@ class RedditScraper:
         'boxoffice'
     ]
     
-    def __init__(self, client_id: str = None, client_secret: str = None, user_agent: str = None):
+    # PRAW instances shared per (client_id, client_secret, user_agent); idle worker instances
+    # for concurrent searches are pooled per credentials too
+    _clients: Dict[Tuple[str, str, str], praw.Reddit] = {}
+    _idle_clients: Dict[Tuple[str, str, str], queue.SimpleQueue] = {}
+    _clients_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        client_id: str = None,
+        client_secret: str = None,
+        user_agent: str = None,
+        max_workers: int = 8,
+        seen_cache: Optional[Path] = None
+    ):
         """
         Initialize Reddit scraper with PRAW.
         
@@ -40,21 +55,46 @@ class RedditScraper:
             client_id: Reddit API client ID
             client_secret: Reddit API client secret  
             user_agent: User agent string
+            max_workers: Searches run concurrently by search_movie_discussions
+            seen_cache: Path of an on-disk set of scraped submission IDs; when given,
+                submissions returned by earlier runs are skipped (None disables)
         """
         if not all([client_id, client_secret, user_agent]):
             client_id, client_secret, user_agent = self._load_credentials()
         
+        self._credentials = (client_id, client_secret, user_agent)
+        self.max_workers = max_workers
+        # Submission IDs from earlier runs; the shelf is opened on first use
+        self._seen_cache = ShelfCache(seen_cache, 'Reddit seen cache', memory=False)
+        
         try:
-            self.reddit = praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent=user_agent
-            )
+            self.reddit = self._get_client(self._credentials)
             logger.info("Reddit API initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Reddit API: {e}")
             raise
     
+    @classmethod
+    def _get_client(cls, credentials: Tuple[str, str, str]) -> praw.Reddit:
+        """Shared PRAW instance for a set of credentials (created on first use)"""
+        with cls._clients_lock:
+            client = cls._clients.get(credentials)
+            if client is None:
+                client = cls._new_reddit(credentials)
+                cls._clients[credentials] = client
+                cls._idle_clients[credentials] = queue.SimpleQueue()
+            return client
+    
+    @staticmethod
+    def _new_reddit(credentials: Tuple[str, str, str]) -> praw.Reddit:
+        """Create a PRAW instance from (client_id, client_secret, user_agent)"""
+        client_id, client_secret, user_agent = credentials
+        return praw.Reddit(
+            client_id=client_id,
+            client_secret=client_secret,
+            user_agent=user_agent
+        )
+    
     def _load_credentials(self):
         """Load Reddit credentials from config"""
         config_path = Path(__file__).parent.parent.parent / 'config' / 'api_keys.yaml'
@@ -71,12 +111,25 @@ class RedditScraper:
             logger.error(f"Error loading Reddit credentials: {e}")
             raise
     
+    def _seen_before(self, submission_id: str) -> bool:
+        """Whether a submission was scraped by an earlier run"""
+        return submission_id in self._seen_cache
+    
+    def _mark_seen(self, submission_ids: List[str]):
+        """Record scraped submissions in the on-disk seen set"""
+        self._seen_cache.update(dict.fromkeys(submission_ids, True), sync=True)
+    
+    def close(self):
+        """Close the on-disk seen cache (the shared PRAW instances stay open for other scrapers)"""
+        self._seen_cache.close()
+    
     def search_movie_discussions(
         self,
         search_terms: List[str],
         subreddits: List[str] = None,
         limit: int = 30,
-        time_filter: str = 'all'
+        time_filter: str = 'all',
+        min_score: Optional[int] = None
     ) -> List[Dict]:
         """
         Search for movie discussions across subreddits.
@@ -86,6 +139,7 @@ class RedditScraper:
             subreddits: List of subreddits to search (default: MOVIE_SUBREDDITS)
             limit: Maximum results per search term per subreddit
             time_filter: Time filter ('all', 'year', 'month', 'week', 'day')
+            min_score: Skip submissions scored below this (None keeps all)
         
         Returns:
             List of discussion/review dictionaries
@@ -95,41 +149,120 @@ class RedditScraper:
         
         all_posts = []
         seen_ids = set()
+        new_ids = []
         
-        for subreddit_name in subreddits:
-            try:
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                for term in search_terms:
-                    try:
-                        # Search subreddit
-                        for submission in subreddit.search(
-                            term, 
-                            limit=limit, 
-                            time_filter=time_filter,
-                            sort='relevance'
-                        ):
-                            # Avoid duplicates
-                            if submission.id in seen_ids:
-                                continue
-                            seen_ids.add(submission.id)
-                            
-                            # Parse submission
-                            post_data = self._parse_submission(submission)
-                            if post_data:
-                                all_posts.append(post_data)
-                                
-                    except Exception as e:
-                        logger.error(f"Error searching '{term}' in r/{subreddit_name}: {e}")
+        # One multi-subreddit search (r/a+b+c) per term; the terms run concurrently and
+        # results are merged in term order
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(search_terms)))) as pool:
+            results = pool.map(
+                lambda term: self._search_one(subreddits, term, limit, time_filter, min_score),
+                search_terms
+            )
+            
+            for submissions in results:
+                for submission_id, post_data in submissions:
+                    # Avoid duplicates
+                    if submission_id in seen_ids:
                         continue
-                        
-            except Exception as e:
-                logger.error(f"Error accessing r/{subreddit_name}: {e}")
-                continue
+                    seen_ids.add(submission_id)
+                    
+                    if post_data:
+                        all_posts.append(post_data)
+                        new_ids.append(submission_id)
+        
+        # Only returned posts are recorded, so a later run with a lower min_score still sees the rest
+        self._mark_seen(new_ids)
         
         logger.info(f"Found {len(all_posts)} unique posts from Reddit")
         return all_posts
     
+    def _search_one(
+        self,
+        subreddits: List[str],
+        term: str,
+        limit: int,
+        time_filter: str,
+        min_score: Optional[int] = None
+    ) -> List[Tuple[str, Optional[Dict]]]:
+        """
+        Search several subreddits for one term in a single request, on a borrowed PRAW instance.
+        
+        The combined listing is capped at limit * len(subreddits) overall, so
+        each subreddit is held to its own limit afterwards. If the listing was
+        cut off, subreddits with no results in it (crowded out by a busier one)
+        are topped up with their own search. Subreddits that got some results
+        but fewer than limit are not, since one more request each would undo
+        the point of the combined search; they may come back short. If the
+        combined search fails (e.g. one subreddit is private or banned), each
+        subreddit is searched on its own so the others still return results.
+        
+        Args:
+            subreddits: Subreddits to search
+            term: Search query
+            limit: Maximum results per subreddit
+            time_filter: Time filter
+            min_score: Skip submissions scored below this (None keeps all)
+        
+        Returns:
+            List of (submission id, parsed submission or None) in result order
+        """
+        # PRAW is not thread-safe, so each concurrent search borrows its own instance
+        idle_clients = self._idle_clients[self._credentials]
+        try:
+            reddit = idle_clients.get_nowait()
+        except queue.Empty:
+            reddit = self._new_reddit(self._credentials)
+        
+        found = []
+        # Results taken per subreddit, and whether the combined listing hit its cap
+        counts = {name.lower(): 0 for name in subreddits}
+        truncated = False
+        subreddit_name = '+'.join(subreddits)
+        try:
+            subreddit = reddit.subreddit(subreddit_name)
+            listed = 0
+            for submission in subreddit.search(
+                term, 
+                limit=limit * len(subreddits), 
+                time_filter=time_filter,
+                sort='relevance'
+            ):
+                listed += 1
+                name = submission.subreddit.display_name.lower()
+                if counts.get(name, 0) >= limit:
+                    continue  # This subreddit already has its share
+                counts[name] = counts.get(name, 0) + 1
+                
+                # Posts from earlier runs and low-scored posts are dropped before
+                # they are parsed
+                if self._seen_before(submission.id):
+                    found.append((submission.id, None))
+                    continue
+                if min_score is not None and submission.score < min_score:
+                    found.append((submission.id, None))
+                    continue
+                found.append((submission.id, self._parse_submission(submission)))
+            truncated = listed >= limit * len(subreddits)
+                
+        except Exception as e:
+            logger.error(f"Error searching '{term}' in r/{subreddit_name}: {e}")
+            if len(subreddits) > 1:
+                for name in subreddits:
+                    found.extend(self._search_one([name], term, limit, time_filter, min_score))
+        finally:
+            idle_clients.put(reddit)
+        
+        if truncated and len(subreddits) > 1:
+            found_ids = {submission_id for submission_id, _ in found}
+            for name in subreddits:
+                if counts[name.lower()] == 0:
+                    found.extend(
+                        entry for entry in self._search_one([name], term, limit, time_filter, min_score)
+                        if entry[0] not in found_ids
+                    )
+        
+        return found
+    
     def _parse_submission(self, submission) -> Optional[Dict]:
         """
         Parse a Reddit submission.
@@ -141,7 +274,7 @@ class RedditScraper:
             Dictionary with submission data
         """
         try:
-            # Combine title and selftext for full content
+            # Combine title and selftext for full content (checked before the other fields are read)
             text = submission.title
             if submission.selftext:
                 text += "\n\n" + submission.selftext
@@ -188,6 +321,9 @@ class RedditScraper:
         """
         try:
             submission = self.reddit.submission(id=submission_id)
+            # Only the first `limit` comments are used, so only that many are fetched
+            # (instead of the whole comment forest of a popular thread)
+            submission.comment_limit = limit
             submission.comments.replace_more(limit=0)  # Remove "more comments" objects
             
             comments = []
@@ -2,21 +2,72 @@
 Rotten Tomatoes scraper for critic and audience reviews.
 """
 
+import asyncio
+import calendar
+import hashlib
+import io
+import math
 import requests
-from bs4 import BeautifulSoup
-import time
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree, html as lxml_html
 import re
 from datetime import datetime
-from typing import List, Dict, Optional
-import sys
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import urllib.parse
 
-sys.path.append(str(Path(__file__).parent.parent))
 from utils.logger import setup_logger
+from utils.rate_limit import AdaptiveTokenBucket, retry_after_seconds
+from utils.scraping import ShelfCache, arun_many, aretrying_request, run_many, shared_session
+from utils.xpath import class_step
+
+# Optional: async scraping (ascrape_reviews / ascrape_movie_reviews)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Optional: brotli-compressed responses (requests/urllib3 and aiohttp decode them when installed)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 logger = setup_logger(__name__)
 
+# Persistent (title, year) -> RT slug cache (shelve adds its own file extension)
+RT_SLUG_CACHE_PATH = Path.home() / '.cache' / 'hybrid-rec-sys' / 'rt_slugs'
+
+# Patterns used for every slug and audience rating
+_RE_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_RE_SLUG_SPACES = re.compile(r'[\s_]+')
+_RE_NUMBER = re.compile(r'(\d+\.?\d*)')
+
+# Critic rating for a fresh (True) or rotten (False) score; no score icon gives None
+_FRESH_RATING = {True: 1.0, False: 0.0}
+
+# Abbreviated month name -> number, for parsing review dates without strptime
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_abbr) if name}
+
+
+def _text_key(text: str) -> str:
+    """
+    Stable key for a review's text (used in source_id).
+    
+    Unlike hash(), which is randomized per process, the same text gets the
+    same key on every run; case and whitespace differences are ignored.
+    
+    Args:
+        text: Review text
+    
+    Returns:
+        16-character hex digest
+    """
+    normalized = ' '.join(text.lower().split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
 
 class RottenTomatoesScraper:
     """Scrape reviews from Rotten Tomatoes"""
@@ -25,18 +76,102 @@ class RottenTomatoesScraper:
     HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
         'Accept-Language': 'en-US,en;q=0.9',
+        # Only advertise br when it can be decoded
+        'Accept-Encoding': 'br, gzip' if BROTLI_AVAILABLE else 'gzip',
     }
+    # Review pages in output order: (review type, value of the page's ?type= parameter)
+    REVIEW_ENDPOINTS = (('audience', 'user'), ('critic', 'top_critics'))
+    # Pages are parsed with lxml directly; each lookup is one compiled XPath evaluated in C
+    HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+    # RT search results have evolved: result rows, or (older layout) result name links
+    XP_SEARCH_ROWS = etree.XPath('//search-page-media-row')
+    XP_SEARCH_LINKS = etree.XPath('//a[@data-qa="info-name"]')
+    XP_TEXT = etree.XPath('.//' + class_step('p', 'review-text'))
+    XP_STARS = etree.XPath('.//' + class_step('span', 'star-display'))
+    XP_ICON = etree.XPath('.//' + class_step('span', 'icon'))
+    XP_AUTHOR = etree.XPath('.//' + class_step('a', 'display-name'))
+    XP_DATE = etree.XPath('.//' + class_step('span', 'review-date'))
     
-    def __init__(self, rate_limit: float = 2.0):
+    def __init__(
+        self,
+        rate_limit: float = 2.0,
+        page_cache: Optional[Path] = None,
+        slug_cache: Optional[Path] = RT_SLUG_CACHE_PATH
+    ):
         """
         Initialize Rotten Tomatoes scraper.
         
         Args:
-            rate_limit: Seconds between requests
+            rate_limit: Average seconds between requests
+            page_cache: Path of an on-disk cache of review pages; when given, cached
+                pages are revalidated with conditional GETs (None disables)
+            slug_cache: Path of the on-disk slug cache (None keeps found slugs in memory only)
         """
         self.rate_limit = rate_limit
-        self.session = requests.Session()
-        self.session.headers.update(self.HEADERS)
+        # Found slugs keyed by (title, year); the shelf is opened on first use
+        self._slug_cache = ShelfCache(slug_cache, 'RT slug cache')
+        # url -> (ETag, Last-Modified, body) of fetched review pages; the shelf is opened on first use
+        self._page_cache = ShelfCache(page_cache, 'RT page cache', memory=False)
+        # Requests only wait when they would exceed the average rate (bursts of ~2s allowed);
+        # the rate backs off while RT answers 429/503
+        self._bucket = AdaptiveTokenBucket(
+            rate=1 / rate_limit if rate_limit > 0 else math.inf,
+            capacity=max(1, int(2 / rate_limit)) if rate_limit > 0 else 1
+        )
+        # HTTP session shared by all RT scrapers, so instances reuse its open connections
+        self.session = shared_session('rotten_tomatoes', self.HEADERS, allowed_methods=('GET', 'HEAD'))
+    
+    # Statuses RT uses when it wants clients to slow down
+    THROTTLE_STATUSES = (429, 503)
+    
+    def _note_response(self, status: int, headers, history=()):
+        """
+        Adapt the request rate to a response.
+        
+        Args:
+            status: Final status code
+            headers: Response headers (for Retry-After)
+            history: Earlier attempts that were retried (urllib3 RequestHistory entries)
+        """
+        if status in self.THROTTLE_STATUSES:
+            self._bucket.on_throttle(retry_after_seconds(headers.get('Retry-After')))
+        elif any(attempt.status in self.THROTTLE_STATUSES for attempt in history):
+            # urllib3 already waited out Retry-After before retrying; just slow down
+            self._bucket.on_throttle()
+        else:
+            self._bucket.on_success()
+    
+    def _note_requests_response(self, response: requests.Response):
+        """_note_response for a requests response, including the retries urllib3 made"""
+        retries = getattr(response.raw, 'retries', None)
+        self._note_response(response.status_code, response.headers, retries.history if retries else ())
+    
+    def _store_page(self, url: str, etag: Optional[str], last_modified: Optional[str], content: bytes):
+        """Cache a page that carries validators (pages without them cannot be revalidated)"""
+        if etag or last_modified:
+            self._page_cache.set(url, (etag, last_modified, content))
+    
+    async def _astore_page(self, url: str, etag: Optional[str], last_modified: Optional[str], content: bytes):
+        """Async version of _store_page (the disk write runs off the event loop)"""
+        if etag or last_modified:
+            await self._page_cache.aset(url, (etag, last_modified, content))
+    
+    @staticmethod
+    def _conditional_headers(cached: Optional[Tuple[Optional[str], Optional[str], bytes]]) -> Dict:
+        """If-None-Match / If-Modified-Since headers for revalidating a cached page"""
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def close(self):
+        """Close the on-disk caches (the shared HTTP session stays open for other instances)"""
+        self._slug_cache.close()
+        self._page_cache.close()
     
     def search_movie(self, title: str, year: Optional[int] = None) -> Optional[str]:
         """
@@ -49,48 +184,118 @@ class RottenTomatoesScraper:
         Returns:
             RT movie slug (e.g., 'inception_2010') or None
         """
-        try:
-            search_query = title
-            if year:
-                search_query += f" {year}"
-            
-            search_url = f"{self.BASE_URL}/search"
-            params = {'search': search_query}
-            
-            time.sleep(self.rate_limit)
-            response = self.session.get(search_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find movie results
-            # RT search results have evolved, try multiple selectors
-            results = soup.find_all('search-page-media-row')
-            
-            if not results:
-                # Try alternative structure
-                results = soup.find_all('a', attrs={'data-qa': 'info-name'})
-            
-            for result in results:
-                try:
-                    link = result.get('href') or result.find('a').get('href')
-                    if link and '/m/' in link:
-                        # Extract slug from URL
-                        slug = link.split('/m/')[-1].split('/')[0]
-                        logger.info(f"Found RT slug for '{title}': {slug}")
-                        return slug
-                except:
-                    continue
-            
-            # Fallback: try constructing slug from title
+        key = self._search_key(title, year)
+        slug = self._slug_cache.get(key)
+        if slug:
+            return slug
+        
+        # Most slugs are just the title (and year), so a HEAD request on the constructed
+        # slug usually settles it without downloading and parsing the search page
+        slug = self._probe_slug(self._construct_slug(title, year))
+        
+        if not slug:
+            try:
+                search_url = f"{self.BASE_URL}/search"
+                params = self._search_params(title, year)
+                
+                self._bucket.acquire()
+                response = self.session.get(search_url, params=params, timeout=30)
+                self._note_requests_response(response)
+                response.raise_for_status()
+                
+                slug = self._parse_search_results(response.content)
+                
+            except Exception as e:
+                logger.error(f"Error searching RT for '{title}': {e}")
+                # Return constructed slug as fallback
+                return self._construct_slug(title, year)
+        
+        if slug:
+            self._slug_cache.set(key, slug)
+        return self._found_slug(title, year, slug)
+    
+    def _found_slug(self, title: str, year: Optional[int], slug: Optional[str]) -> str:
+        """Log a slug found by probe or search, or fall back to one constructed from the title"""
+        if not slug:
             slug = self._construct_slug(title, year)
             logger.info(f"Using constructed slug for '{title}': {slug}")
             return slug
-            
+        
+        logger.info(f"Found RT slug for '{title}': {slug}")
+        return slug
+    
+    @staticmethod
+    def _search_key(title: str, year: Optional[int] = None) -> str:
+        """Cache key for a search"""
+        return f"{title.strip().lower()}|{year or ''}"
+    
+    def _probe_slug(self, slug: str) -> Optional[str]:
+        """
+        Check whether a movie page exists, with a HEAD request.
+        
+        Args:
+            slug: Candidate RT slug
+        
+        Returns:
+            Slug of the page /m/{slug} resolves to (after redirects), or None
+        """
+        try:
+            self._bucket.acquire()
+            response = self.session.head(self._movie_url(slug), allow_redirects=True, timeout=10)
+            self._note_requests_response(response)
         except Exception as e:
-            logger.error(f"Error searching RT for '{title}': {e}")
-            # Return constructed slug as fallback
-            return self._construct_slug(title, year)
+            logger.debug(f"RT slug probe failed for '{slug}': {e}")
+            return None
+        
+        return self._slug_from_url(response.url) if response.status_code == 200 else None
+    
+    def _movie_url(self, slug: str) -> str:
+        """URL of a movie's main page"""
+        return f"{self.BASE_URL}/m/{slug}"
+    
+    @staticmethod
+    def _slug_from_url(url: str) -> Optional[str]:
+        """Movie slug in an RT URL, or None if it is not a movie page"""
+        if '/m/' not in url:
+            return None
+        return url.split('/m/')[-1].split('/')[0] or None
+    
+    @staticmethod
+    def _search_params(title: str, year: Optional[int] = None) -> Dict:
+        """Query parameters of the RT search page"""
+        search_query = title
+        if year:
+            search_query += f" {year}"
+        return {'search': search_query}
+    
+    def _parse_search_results(self, content: bytes) -> Optional[str]:
+        """
+        Pick the movie slug from an RT search page.
+        
+        Args:
+            content: Raw HTML of the search page
+        
+        Returns:
+            Slug of the first movie result, or None
+        """
+        root = lxml_html.parse(io.BytesIO(content), parser=self.HTML_PARSER).getroot()
+        
+        # Find movie results (rows first, then the alternative structure)
+        results = []
+        if root is not None:
+            results = self.XP_SEARCH_ROWS(root) or self.XP_SEARCH_LINKS(root)
+        
+        for result in results:
+            link = result.get('href')
+            if not link:
+                anchor = result.find('.//a')
+                link = anchor.get('href') if anchor is not None else None
+            
+            if link and '/m/' in link:
+                # Extract slug from URL
+                return link.split('/m/')[-1].split('/')[0]
+        
+        return None
     
     def _construct_slug(self, title: str, year: Optional[int] = None) -> str:
         """
@@ -105,8 +310,8 @@ class RottenTomatoesScraper:
         """
         # Clean and format title
         slug = title.lower()
-        slug = re.sub(r'[^\w\s-]', '', slug)  # Remove special chars
-        slug = re.sub(r'[\s_]+', '_', slug)   # Replace spaces with underscores
+        slug = _RE_SLUG_STRIP.sub('', slug)  # Remove special chars
+        slug = _RE_SLUG_SPACES.sub('_', slug)   # Replace spaces with underscores
         slug = slug.strip('_')
         
         if year:
@@ -123,6 +328,9 @@ class RottenTomatoesScraper:
         """
         Scrape reviews for a movie.
         
+        With review_type='both' the audience and critic pages are fetched
+        concurrently (the rate limiter still spaces the requests).
+        
         Args:
             movie_slug: RT movie slug
             max_reviews: Maximum number of reviews
@@ -131,122 +339,212 @@ class RottenTomatoesScraper:
         Returns:
             List of review dictionaries
         """
-        all_reviews = []
+        endpoints = self._review_endpoints(movie_slug, review_type)
+        per_type = max_reviews // 2 if review_type == 'both' else max_reviews
         
-        if review_type in ['audience', 'both']:
-            audience_reviews = self._scrape_audience_reviews(movie_slug, max_reviews // 2 if review_type == 'both' else max_reviews)
-            all_reviews.extend(audience_reviews)
-        
-        if review_type in ['critic', 'both']:
-            critic_reviews = self._scrape_critic_reviews(movie_slug, max_reviews // 2 if review_type == 'both' else max_reviews)
-            all_reviews.extend(critic_reviews)
+        with ThreadPoolExecutor(max_workers=max(1, len(endpoints))) as pool:
+            results = pool.map(lambda endpoint: self._scrape_endpoint(movie_slug, per_type, *endpoint), endpoints)
+            all_reviews = [review for reviews in results for review in reviews]
         
         logger.info(f"Scraped {len(all_reviews)} reviews from RT for {movie_slug}")
         return all_reviews
     
-    def _scrape_audience_reviews(self, movie_slug: str, max_reviews: int) -> List[Dict]:
-        """Scrape audience reviews"""
-        reviews = []
+    def _review_endpoints(self, movie_slug: str, review_type: str) -> List[Tuple[str, str, Callable]]:
+        """
+        Review pages to scrape for a review type.
         
+        Args:
+            movie_slug: RT movie slug
+            review_type: 'audience', 'critic', or 'both'
+        
+        Returns:
+            List of (review type, page URL, review element parser)
+        """
+        parsers = {'audience': self._parse_audience_review, 'critic': self._parse_critic_review}
+        return [
+            (kind, f"{self.BASE_URL}/m/{movie_slug}/reviews?type={page_type}", parsers[kind])
+            for kind, page_type in self.REVIEW_ENDPOINTS
+            if review_type in (kind, 'both')
+        ]
+    
+    def _scrape_endpoint(
+        self,
+        movie_slug: str,
+        max_reviews: int,
+        kind: str,
+        url: str,
+        parse_review: Callable
+    ) -> List[Dict]:
+        """Scrape one reviews page (see _review_endpoints)"""
         try:
-            url = f"{self.BASE_URL}/m/{movie_slug}/reviews?type=user"
-            
-            time.sleep(self.rate_limit)
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find review containers
-            review_elements = soup.find_all('div', class_='review-row')
-            
-            for elem in review_elements[:max_reviews]:
-                try:
-                    review = self._parse_audience_review(elem, movie_slug)
-                    if review:
-                        reviews.append(review)
-                except Exception as e:
-                    logger.error(f"Error parsing audience review: {e}")
-                    continue
-            
-            return reviews
+            return self._parse_review_page(self._fetch_page(url), movie_slug, max_reviews, parse_review, kind)
             
         except Exception as e:
-            logger.error(f"Error scraping audience reviews for {movie_slug}: {e}")
-            return reviews
+            logger.error(f"Error scraping {kind} reviews for {movie_slug}: {e}")
+            return []
     
-    def _scrape_critic_reviews(self, movie_slug: str, max_reviews: int) -> List[Dict]:
-        """Scrape critic reviews"""
-        reviews = []
+    def _fetch_page(self, url: str) -> Iterator[bytes]:
+        """
+        GET a review page once the rate limiter allows it, yielding the body as it arrives.
         
-        try:
-            url = f"{self.BASE_URL}/m/{movie_slug}/reviews?type=top_critics"
-            
-            time.sleep(self.rate_limit)
-            response = self.session.get(url, timeout=30)
+        With the page cache enabled, a cached copy is revalidated and reused
+        when the server answers 304 Not Modified, and pages with validators
+        are read in full so they can be cached.
+        
+        Args:
+            url: Page URL
+        
+        Yields:
+            Chunks of the page's raw HTML
+        """
+        cached = self._page_cache.get(url)
+        
+        self._bucket.acquire()
+        with self.session.get(url, headers=self._conditional_headers(cached), timeout=30, stream=True) as response:
+            self._note_requests_response(response)
+            if cached and response.status_code == 304:
+                yield cached[2]
+                return
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find review containers
-            review_elements = soup.find_all('div', class_='review-row')
-            
-            for elem in review_elements[:max_reviews]:
-                try:
-                    review = self._parse_critic_review(elem, movie_slug)
-                    if review:
-                        reviews.append(review)
-                except Exception as e:
-                    logger.error(f"Error parsing critic review: {e}")
-                    continue
-            
-            return reviews
-            
-        except Exception as e:
-            logger.error(f"Error scraping critic reviews for {movie_slug}: {e}")
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if self._page_cache.on_disk and (etag or last_modified):
+                self._store_page(url, etag, last_modified, response.content)
+                yield response.content
+            else:
+                # Not cached: stop downloading once the parser has enough reviews
+                yield from response.iter_content(chunk_size=65536)
+    
+    def _parse_review_page(
+        self,
+        content: Union[bytes, Iterable[bytes]],
+        movie_slug: str,
+        max_reviews: int,
+        parse_review: Callable,
+        review_type: str
+    ) -> List[Dict]:
+        """
+        Parse the first max_reviews review rows of one reviews page.
+        
+        The page is fed to an incremental parser: each review row is parsed
+        as soon as it is complete and then cleared, and the rest of the body
+        is not read once max_reviews rows have been seen.
+        
+        Args:
+            content: Raw HTML of the reviews page, as bytes or an iterable of chunks
+            movie_slug: RT movie slug
+            max_reviews: Maximum number of review rows to parse
+            parse_review: Parser for one review element (audience or critic)
+            review_type: 'audience' or 'critic' (for log messages)
+        
+        Returns:
+            List of review dictionaries
+        """
+        reviews = []
+        if max_reviews <= 0:
             return reviews
+        
+        if isinstance(content, bytes):
+            content = (content,)
+        
+        # One timestamp per page rather than per review
+        scraped_at = datetime.utcnow()
+        
+        rows = 0
+        for elem in self._iter_review_rows(content):
+            try:
+                review = parse_review(elem, movie_slug, scraped_at)
+                if review:
+                    reviews.append(review)
+            except Exception as e:
+                logger.error(f"Error parsing {review_type} review: {e}")
+            elem.clear()
+            
+            rows += 1
+            if rows >= max_reviews:
+                break  # The rest of the page is never read
+        
+        return reviews
+    
+    @staticmethod
+    def _iter_review_rows(chunks: Iterable[bytes]) -> Iterator:
+        """Yield the review-row divs of a page, each as soon as its end tag has been parsed"""
+        parser = etree.HTMLPullParser(events=('end',), tag='div', encoding='utf-8')
+        parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+        
+        def review_rows():
+            for _, element in parser.read_events():
+                if 'review-row' in (element.get('class') or '').split():
+                    yield element
+        
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from review_rows()
+        
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            return  # Empty body
+        yield from review_rows()
+    
+    @staticmethod
+    def _first(xpath: etree.XPath, element):
+        """First element matched by xpath under element, or None"""
+        found = xpath(element)
+        return found[0] if found else None
     
-    def _parse_audience_review(self, elem, movie_slug: str) -> Optional[Dict]:
-        """Parse audience review element"""
+    def _parse_audience_review(
+        self,
+        elem,
+        movie_slug: str,
+        scraped_at: Optional[datetime] = None
+    ) -> Optional[Dict]:
+        """
+        Parse audience review element.
+        
+        Args:
+            elem: lxml review-row div
+            movie_slug: RT movie slug
+            scraped_at: Time the page was fetched (defaults to now)
+        
+        Returns:
+            Review dictionary or None
+        """
         try:
             # Review text
-            text_elem = elem.find('p', class_='review-text')
-            if not text_elem:
+            text_elem = self._first(self.XP_TEXT, elem)
+            if text_elem is None:
                 return None
-            text = text_elem.text.strip()
+            text = text_elem.text_content().strip()
             
             if len(text) < 20:
                 return None
             
             # Rating (fresh/rotten)
-            rating_elem = elem.find('span', class_='star-display')
+            rating_elem = self._first(self.XP_STARS, elem)
             rating = None
-            if rating_elem:
+            if rating_elem is not None:
                 # Extract rating from class or text
-                classes = rating_elem.get('class', [])
-                if 'star-display--rated' in ' '.join(classes):
-                    # Try to extract numeric rating
-                    match = re.search(r'(\d+\.?\d*)', str(rating_elem))
+                if 'star-display--rated' in (rating_elem.get('class') or ''):
+                    # Try to extract numeric rating (e.g. data-rating / aria-label)
+                    match = self._rating_match(rating_elem)
                     if match:
                         rating = float(match.group(1))
             
             # Author
-            author_elem = elem.find('a', class_='display-name')
-            author = author_elem.text.strip() if author_elem else None
+            author_elem = self._first(self.XP_AUTHOR, elem)
+            author = author_elem.text_content().strip() if author_elem is not None else None
             
             # Date
-            date_elem = elem.find('span', class_='review-date')
+            date_elem = self._first(self.XP_DATE, elem)
             review_date = None
-            if date_elem:
-                date_str = date_elem.text.strip()
-                try:
-                    review_date = datetime.strptime(date_str, '%b %d, %Y')
-                except:
-                    pass
+            if date_elem is not None:
+                review_date = self._parse_review_date(date_elem.text_content().strip())
             
             return {
                 'source': 'rotten_tomatoes',
-                'source_id': f"rt_audience_{movie_slug}_{hash(text)}",
+                'source_id': f"rt_audience_{movie_slug}_{_text_key(text)}",
                 'movie_slug': movie_slug,
                 'text': text,
                 'rating': rating,
@@ -255,47 +553,76 @@ class RottenTomatoesScraper:
                 'review_date': review_date,
                 'review_length': len(text),
                 'word_count': len(text.split()),
-                'scraped_at': datetime.utcnow()
+                'scraped_at': scraped_at or datetime.utcnow()
             }
             
         except Exception as e:
             logger.error(f"Error parsing audience review: {e}")
             return None
     
-    def _parse_critic_review(self, elem, movie_slug: str) -> Optional[Dict]:
-        """Parse critic review element"""
+    @staticmethod
+    def _rating_match(rating_elem):
+        """
+        First number in a star-display element's markup.
+        
+        Attribute values come first in the markup, so they are searched
+        directly; the element is only serialized when none of them holds
+        a number.
+        """
+        for value in rating_elem.attrib.values():
+            match = _RE_NUMBER.search(value)
+            if match:
+                return match
+        return _RE_NUMBER.search(
+            etree.tostring(rating_elem, encoding='unicode', method='html', with_tail=False)
+        )
+    
+    def _parse_critic_review(
+        self,
+        elem,
+        movie_slug: str,
+        scraped_at: Optional[datetime] = None
+    ) -> Optional[Dict]:
+        """
+        Parse critic review element.
+        
+        Args:
+            elem: lxml review-row div
+            movie_slug: RT movie slug
+            scraped_at: Time the page was fetched (defaults to now)
+        
+        Returns:
+            Review dictionary or None
+        """
         try:
             # Review text
-            text_elem = elem.find('p', class_='review-text')
-            if not text_elem:
+            text_elem = self._first(self.XP_TEXT, elem)
+            if text_elem is None:
                 return None
-            text = text_elem.text.strip()
+            text = text_elem.text_content().strip()
             
             if len(text) < 20:
                 return None
             
             # Fresh/Rotten score
-            score_elem = elem.find('span', class_='icon')
-            fresh = 'fresh' in str(score_elem) if score_elem else None
-            rating = 1.0 if fresh else 0.0 if fresh is not None else None
+            score_elem = self._first(self.XP_ICON, elem)
+            # Check the class tokens instead of serializing the tag back to HTML
+            fresh = any('fresh' in c for c in (score_elem.get('class') or '').split()) if score_elem is not None else None
+            rating = _FRESH_RATING.get(fresh)
             
             # Author and publication
-            author_elem = elem.find('a', class_='display-name')
-            author = author_elem.text.strip() if author_elem else None
+            author_elem = self._first(self.XP_AUTHOR, elem)
+            author = author_elem.text_content().strip() if author_elem is not None else None
             
             # Date
-            date_elem = elem.find('span', class_='review-date')
+            date_elem = self._first(self.XP_DATE, elem)
             review_date = None
-            if date_elem:
-                date_str = date_elem.text.strip()
-                try:
-                    review_date = datetime.strptime(date_str, '%b %d, %Y')
-                except:
-                    pass
+            if date_elem is not None:
+                review_date = self._parse_review_date(date_elem.text_content().strip())
             
             return {
                 'source': 'rotten_tomatoes',
-                'source_id': f"rt_critic_{movie_slug}_{hash(text)}",
+                'source_id': f"rt_critic_{movie_slug}_{_text_key(text)}",
                 'movie_slug': movie_slug,
                 'text': text,
                 'rating': rating,
@@ -304,13 +631,36 @@ class RottenTomatoesScraper:
                 'review_date': review_date,
                 'review_length': len(text),
                 'word_count': len(text.split()),
-                'scraped_at': datetime.utcnow()
+                'scraped_at': scraped_at or datetime.utcnow()
             }
             
         except Exception as e:
             logger.error(f"Error parsing critic review: {e}")
             return None
     
+    @staticmethod
+    def _parse_review_date(date_str: str) -> Optional[datetime]:
+        """
+        Parse an RT review date such as 'Jul 16, 2010'.
+        
+        The common 'Mon day, year' form is split directly; anything else
+        goes through strptime.
+        
+        Args:
+            date_str: Date text from the review
+        
+        Returns:
+            datetime or None if the text is not a date
+        """
+        parts = date_str.split()
+        try:
+            if (len(parts) == 3 and parts[0].lower() in _MONTHS and parts[1].endswith(',')
+                    and len(parts[1]) <= 3 and len(parts[2]) == 4):
+                return datetime(int(parts[2]), _MONTHS[parts[0].lower()], int(parts[1][:-1]))
+            return datetime.strptime(date_str, '%b %d, %Y')
+        except ValueError:
+            return None
+    
     def scrape_movie_reviews(
         self,
         title: str,
@@ -337,6 +687,199 @@ class RottenTomatoesScraper:
                 return []
         
         return self.scrape_reviews(movie_slug, max_reviews)
+    
+    def scrape_many_movie_reviews(
+        self,
+        movies: List[Dict],
+        max_reviews: int = 40,
+        concurrency: int = 4
+    ) -> List[List[Dict]]:
+        """
+        Search + scrape reviews for many movies, several at a time.
+        
+        Uses aiohttp when it is installed and no event loop is running;
+        otherwise a thread pool sharing this scraper's session. Either way
+        the token bucket keeps the overall request rate.
+        
+        Args:
+            movies: List of movie dictionaries with keys: title, year, movie_slug (optional)
+            max_reviews: Maximum reviews to scrape per movie
+            concurrency: Movies scraped concurrently
+        
+        Returns:
+            List of review lists, aligned with movies
+        """
+        return run_many(
+            movies,
+            concurrency,
+            lambda session, movie: self.ascrape_movie_reviews(
+                session, movie.get('title'), movie.get('year'), movie.get('movie_slug'), max_reviews
+            ),
+            lambda movie: self.scrape_movie_reviews(
+                movie.get('title'), movie.get('year'), movie.get('movie_slug'), max_reviews
+            ),
+            self.HEADERS
+        )
+    
+    async def ascrape_many(
+        self,
+        movies: List[Dict],
+        max_reviews: int = 40,
+        concurrency: int = 4
+    ) -> List[List[Dict]]:
+        """
+        Async version of scrape_many_movie_reviews (requires aiohttp).
+        
+        All movies share one aiohttp session; at most `concurrency` are
+        scraped at a time.
+        
+        Args:
+            movies: List of movie dictionaries with keys: title, year, movie_slug (optional)
+            max_reviews: Maximum reviews to scrape per movie
+            concurrency: Movies scraped concurrently
+        
+        Returns:
+            List of review lists, aligned with movies
+        """
+        return await arun_many(
+            movies,
+            concurrency,
+            lambda session, movie: self.ascrape_movie_reviews(
+                session, movie.get('title'), movie.get('year'), movie.get('movie_slug'), max_reviews
+            ),
+            self.HEADERS
+        )
+    
+    async def ascrape_reviews(
+        self,
+        session,
+        movie_slug: str,
+        max_reviews: int = 40,
+        review_type: str = 'both'
+    ) -> List[Dict]:
+        """
+        Async version of scrape_reviews over an aiohttp session (requires aiohttp).
+        
+        Args:
+            session: aiohttp.ClientSession
+            movie_slug: RT movie slug
+            max_reviews: Maximum number of reviews
+            review_type: Type of reviews to scrape ('audience', 'critic', or 'both')
+        
+        Returns:
+            List of review dictionaries
+        """
+        endpoints = self._review_endpoints(movie_slug, review_type)
+        per_type = max_reviews // 2 if review_type == 'both' else max_reviews
+        
+        async def scrape_endpoint(kind: str, url: str, parse_review: Callable) -> List[Dict]:
+            try:
+                content = await self._afetch_page(session, url)
+                return self._parse_review_page(content, movie_slug, per_type, parse_review, kind)
+            except Exception as e:
+                logger.error(f"Error scraping {kind} reviews for {movie_slug}: {e}")
+                return []
+        
+        results = await asyncio.gather(*(scrape_endpoint(*endpoint) for endpoint in endpoints))
+        all_reviews = [review for reviews in results for review in reviews]
+        
+        logger.info(f"Scraped {len(all_reviews)} reviews from RT for {movie_slug}")
+        return all_reviews
+    
+    async def ascrape_movie_reviews(
+        self,
+        session,
+        title: str,
+        year: Optional[int] = None,
+        movie_slug: Optional[str] = None,
+        max_reviews: int = 40
+    ) -> List[Dict]:
+        """
+        Async version of scrape_movie_reviews over an aiohttp session.
+        
+        Args:
+            session: aiohttp.ClientSession
+            title: Movie title
+            year: Release year
+            movie_slug: RT slug (if known)
+            max_reviews: Maximum reviews
+        
+        Returns:
+            List of review dictionaries
+        """
+        if not movie_slug:
+            movie_slug = await self._asearch_movie(session, title, year)
+            if not movie_slug:
+                logger.warning(f"Cannot scrape reviews - RT slug not found for '{title}'")
+                return []
+        
+        return await self.ascrape_reviews(session, movie_slug, max_reviews)
+    
+    async def _asearch_movie(self, session, title: str, year: Optional[int] = None) -> Optional[str]:
+        """Async version of search_movie (shares its cache; disk access runs off the event loop)"""
+        key = self._search_key(title, year)
+        slug = await self._slug_cache.aget(key)
+        if slug:
+            return slug
+        
+        slug = await self._aprobe_slug(session, self._construct_slug(title, year))
+        
+        if not slug:
+            try:
+                content = await self._afetch(session, f"{self.BASE_URL}/search", self._search_params(title, year))
+                slug = self._parse_search_results(content)
+            except Exception as e:
+                logger.error(f"Error searching RT for '{title}': {e}")
+                return self._construct_slug(title, year)
+        
+        if slug:
+            await self._slug_cache.aset(key, slug)
+        return self._found_slug(title, year, slug)
+    
+    async def _aprobe_slug(self, session, slug: str) -> Optional[str]:
+        """Async version of _probe_slug"""
+        try:
+            await self._bucket.aacquire()
+            history = []
+            async with aretrying_request(
+                session, 'HEAD', self._movie_url(slug), history,
+                allow_redirects=True, timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                self._note_response(response.status, response.headers, history)
+                return self._slug_from_url(str(response.url)) if response.status == 200 else None
+        except Exception as e:
+            logger.debug(f"RT slug probe failed for '{slug}': {e}")
+            return None
+    
+    async def _afetch_page(self, session, url: str) -> bytes:
+        """Async version of _fetch_page"""
+        cached = await self._page_cache.aget(url)
+        
+        await self._bucket.aacquire()
+        history = []
+        async with aretrying_request(
+            session, 'GET', url, history,
+            headers=self._conditional_headers(cached), timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            self._note_response(response.status, response.headers, history)
+            if cached and response.status == 304:
+                return cached[2]
+            response.raise_for_status()
+            content = await response.read()
+            
+            await self._astore_page(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), content)
+            return content
+    
+    async def _afetch(self, session, url: str, params: Optional[Dict] = None) -> bytes:
+        """GET url once the rate limiter allows it and return the body (transient failures are retried)"""
+        await self._bucket.aacquire()
+        history = []
+        async with aretrying_request(
+            session, 'GET', url, history, params=params, timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            self._note_response(response.status, response.headers, history)
+            response.raise_for_status()
+            return await response.read()
 
 
 # Example usage
@@ -0,0 +1,6 @@
+"""Utilities package"""
+
+from .logger import setup_logger
+from .ranking import top_k_indices, normalize_rows
+
+__all__ = ['setup_logger', 'top_k_indices', 'normalize_rows']
@@ -2,11 +2,42 @@
 Utility functions for logging.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
 
 
+LOG_DIR = Path(__file__).parent.parent.parent / 'logs'
+
+# One app.log handler shared by every logger, so the file is opened once.
+# Loggers only enqueue records; a listener thread does the file writes.
+_queue_handler = None
+_file_handler_lock = threading.Lock()
+
+
+def _get_file_handler(formatter):
+    """Return the shared app.log queue handler, starting its file-writing listener on first use"""
+    global _queue_handler
+    with _file_handler_lock:
+        if _queue_handler is None:
+            LOG_DIR.mkdir(exist_ok=True)
+            file_handler = logging.FileHandler(LOG_DIR / 'app.log')
+            file_handler.setFormatter(formatter)
+            
+            log_queue = queue.Queue(-1)
+            listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+            listener.start()
+            # Drain queued records to disk before the interpreter exits
+            atexit.register(listener.stop)
+            
+            _queue_handler = logging.handlers.QueueHandler(log_queue)
+        return _queue_handler
+
+
 def setup_logger(name, level=logging.INFO):
     """
     Set up a logger with both file and console handlers.
@@ -37,13 +68,8 @@ def setup_logger(name, level=logging.INFO):
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
     
-    # File handler (create logs directory if needed)
-    log_dir = Path(__file__).parent.parent.parent / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    
-    file_handler = logging.FileHandler(log_dir / 'app.log')
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # File handler shared by all loggers (each logger's level does the filtering);
+    # records are written by a background thread so callers never block on disk I/O
+    logger.addHandler(_get_file_handler(formatter))
     
     return logger
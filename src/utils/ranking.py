@@ -0,0 +1,43 @@
+"""
+Utility functions for ranking scores.
+"""
+
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Get indices of the k highest scores, ordered best first.
+    
+    Uses a partial sort (O(n + k log k)) instead of sorting every score.
+    
+    Args:
+        scores: 1-D array of scores
+        k: Number of indices to return
+    
+    Returns:
+        Array of up to k indices into scores
+    """
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind='stable')]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row of a dense matrix.
+    
+    With normalized rows, cosine similarity against every row is a single
+    matrix-vector product.
+    
+    Args:
+        matrix: 2-D array
+    
+    Returns:
+        Row-normalized copy of matrix (all-zero rows stay zero)
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.clip(norms, 1e-12, None)
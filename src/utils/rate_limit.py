@@ -0,0 +1,146 @@
+"""
+Rate limiting for scrapers.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one. Requests only wait when the bucket is empty, so a
+    request that follows a slow response is not delayed again, and short
+    bursts up to `capacity` go through immediately. Safe to share between
+    threads.
+    """
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            rate: Tokens added per second (math.inf disables limiting)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take one token, returning how long to wait until it is actually available"""
+        if math.isinf(self.rate):
+            return 0.0
+        
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            
+            # Tokens may go negative: later callers queue behind earlier reservations
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+    
+    def acquire(self):
+        """Block until a request may be made"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def aacquire(self):
+        """Async version of acquire (waits without blocking the event loop)"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket whose rate backs off when the server throttles.
+    
+    The configured rate is the ceiling: on_throttle() halves the rate (down
+    to min_rate) and can hold every caller back for a Retry-After delay,
+    and on_success() grows it back towards the ceiling. Waits get a little
+    random jitter so concurrent callers do not fire in lockstep.
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        capacity: int = 1,
+        min_rate: Optional[float] = None,
+        jitter: float = 0.1
+    ):
+        """
+        Initialize a full bucket at its maximum rate.
+        
+        Args:
+            rate: Maximum tokens added per second (math.inf disables limiting)
+            capacity: Maximum burst size
+            min_rate: Lowest rate after backing off (default: rate / 8)
+            jitter: Random extra wait, as a fraction of one token interval
+        """
+        super().__init__(rate, capacity)
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+        self.jitter = jitter
+    
+    def _reserve(self) -> float:
+        wait = super()._reserve()
+        if wait > 0 and self.jitter:
+            wait += random.uniform(0, self.jitter) / self.rate
+        return wait
+    
+    def on_success(self):
+        """Grow the rate back towards the maximum after an unthrottled response"""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate * 1.25)
+    
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        Back off after a 429/503 response.
+        
+        Args:
+            retry_after: Seconds the server asked clients to wait, if any
+        """
+        if math.isinf(self.rate):
+            return
+        
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                # Pending reservations push the next free token at least retry_after away
+                self.tokens = min(self.tokens, -retry_after * self.rate)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delay in seconds or an HTTP date).
+    
+    Args:
+        value: Header value, or None
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,315 @@
+"""
+Shared plumbing for the scrapers: pooled HTTP sessions, JSON decoding,
+on-disk caches and running one scrape per movie concurrently.
+"""
+
+import asyncio
+import json
+import shelve
+import threading
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import RequestHistory, Retry
+
+from utils.logger import setup_logger
+from utils.rate_limit import retry_after_seconds
+
+# Optional: concurrent scraping over aiohttp (run_many falls back to threads)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Optional: faster JSON parsing/serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = setup_logger(__name__)
+
+# Retry policy shared by the requests sessions (urllib3 Retry) and the aiohttp helpers
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Statuses whose Retry-After header is honoured (as urllib3 does)
+RETRY_AFTER_STATUSES = (413, 429, 503)
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def json_loads(data: Union[str, bytes]):
+    """Parse JSON from str or bytes (orjson when installed; its errors subclass json.JSONDecodeError)"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes"""
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj).encode()
+
+
+def shared_session(name: str, headers: Dict[str, str], allowed_methods: Tuple[str, ...] = ('GET',)) -> requests.Session:
+    """
+    Process-wide HTTP session for one scraper, created on first use.
+    
+    Every instance of the scraper shares the session, so they reuse its
+    pooled keep-alive connections. Transient failures (connection errors,
+    429/5xx) are retried with exponential backoff.
+    
+    Args:
+        name: Scraper name the session is cached under
+        headers: Default request headers
+        allowed_methods: HTTP methods that may be retried
+    
+    Returns:
+        requests.Session
+    """
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(headers)
+            
+            retry = Retry(
+                total=RETRY_TOTAL,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=allowed_methods
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+            session.mount('https://', adapter)
+            _sessions[name] = session
+        return session
+
+
+@asynccontextmanager
+async def aretrying_request(session, method: str, url: str, history: Optional[List] = None, **kwargs):
+    """
+    aiohttp request with the same retry policy as shared_session.
+    
+    Connection errors, timeouts and RETRY_STATUSES responses are retried up
+    to RETRY_TOTAL times with exponential backoff (at least Retry-After when
+    the server sends one). The final response is yielded whatever its
+    status, like urllib3 once its retries are used up.
+    
+    Args:
+        session: aiohttp.ClientSession
+        method: HTTP method
+        url: Request URL
+        history: List that receives a urllib3 RequestHistory per retried attempt
+        **kwargs: Passed to session.request
+    
+    Yields:
+        aiohttp.ClientResponse (released on exit)
+    """
+    for attempt in range(RETRY_TOTAL + 1):
+        delay = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+        try:
+            response = await session.request(method, url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == RETRY_TOTAL:
+                raise
+            if history is not None:
+                history.append(RequestHistory(method, url, e, None, None))
+        else:
+            if response.status not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                try:
+                    yield response
+                finally:
+                    response.release()
+                return
+            
+            if response.status in RETRY_AFTER_STATUSES:
+                delay = max(delay, retry_after_seconds(response.headers.get('Retry-After')) or 0.0)
+            if history is not None:
+                history.append(RequestHistory(method, url, None, response.status, None))
+            response.release()
+        
+        await asyncio.sleep(delay)
+
+
+class ShelfCache:
+    """
+    String-keyed cache backed by a shelve file that is opened on first use.
+    
+    Values read or written are also kept in memory (unless memory=False),
+    so repeat lookups skip the disk. shelve is not thread-safe, so disk
+    access is serialized with a lock; the a* methods run it on a worker
+    thread to keep the event loop free. Without a path, or if the file
+    cannot be opened, the cache works from memory only.
+    """
+    
+    def __init__(self, path: Optional[Path], name: str, memory: bool = True):
+        """
+        Initialize the cache (nothing is opened yet).
+        
+        Args:
+            path: Path of the shelve file (shelve adds its own extension), or None
+            name: Name used in log messages (e.g. 'RT slug cache')
+            memory: Keep values in memory as well
+        """
+        self.path = Path(path) if path is not None else None
+        self.name = name
+        self._memory: Optional[Dict[str, Any]] = {} if memory else None
+        self._shelf = None
+        self._lock = threading.Lock()
+    
+    @property
+    def on_disk(self) -> bool:
+        """Whether values are (still) persisted to disk"""
+        return self.path is not None
+    
+    def _open(self):
+        """Open the shelf, or return None if it is disabled/unavailable (call with the lock held)"""
+        if self._shelf is None and self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._shelf = shelve.open(str(self.path), writeback=False)
+            except Exception as e:
+                fallback = 'caching in memory only' if self._memory is not None else 'continuing without it'
+                logger.warning(f"{self.name} unavailable ({e}); {fallback}")
+                self.path = None
+        return self._shelf
+    
+    def _memory_get(self, key: str):
+        """Value from the in-memory layer, or None"""
+        return self._memory.get(key) if self._memory is not None else None
+    
+    def get(self, key: str):
+        """Value for key from memory or disk, or None"""
+        value = self._memory_get(key)
+        if value is None and self.path is not None:
+            with self._lock:
+                shelf = self._open()
+                if shelf is not None:
+                    value = shelf.get(key)
+            if value is not None and self._memory is not None:
+                self._memory[key] = value
+        return value
+    
+    def set(self, key: str, value):
+        """Store a value in memory and on disk"""
+        self.update({key: value}, sync=False)
+    
+    def update(self, items: Dict[str, Any], sync: bool = False):
+        """
+        Store several values with one lock/open.
+        
+        Args:
+            items: key -> value
+            sync: Flush the shelf to disk afterwards
+        """
+        if self._memory is not None:
+            self._memory.update(items)
+        if self.path is None or not items:
+            return
+        with self._lock:
+            shelf = self._open()
+            if shelf is not None:
+                try:
+                    for key, value in items.items():
+                        shelf[key] = value
+                    if sync:
+                        shelf.sync()
+                except Exception as e:
+                    logger.warning(f"Could not write {self.name}: {e}")
+    
+    def __contains__(self, key: str) -> bool:
+        if self._memory_get(key) is not None:
+            return True
+        if self.path is None:
+            return False
+        with self._lock:
+            shelf = self._open()
+            return shelf is not None and key in shelf
+    
+    async def aget(self, key: str):
+        """Async get: memory hits return directly, disk reads run on a worker thread"""
+        value = self._memory_get(key)
+        if value is None and self.path is not None:
+            value = await asyncio.to_thread(self.get, key)
+        return value
+    
+    async def aset(self, key: str, value):
+        """Async set: the disk write runs on a worker thread"""
+        if self.path is None:
+            self.set(key, value)
+        else:
+            await asyncio.to_thread(self.set, key, value)
+    
+    def close(self):
+        """Close the shelf (it is reopened if the cache is used again)"""
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+
+
+def run_many(
+    items: Iterable,
+    concurrency: int,
+    ascrape: Callable,
+    scrape: Callable,
+    headers: Dict[str, str]
+) -> List:
+    """
+    Run one scrape per item concurrently.
+    
+    Uses aiohttp when it is installed and no event loop is running;
+    otherwise (e.g. inside Jupyter) a thread pool running the blocking
+    version.
+    
+    Args:
+        items: Items to scrape (e.g. movie dictionaries)
+        concurrency: Items scraped concurrently
+        ascrape: Coroutine function (session, item) used with aiohttp
+        scrape: Blocking function (item) used on worker threads otherwise
+        headers: Default headers of the aiohttp session
+    
+    Returns:
+        Results aligned with items
+    """
+    items = list(items)
+    if AIOHTTP_AVAILABLE:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(arun_many(items, concurrency, ascrape, headers))
+    
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        return list(pool.map(scrape, items))
+
+
+async def arun_many(items: Iterable, concurrency: int, ascrape: Callable, headers: Dict[str, str]) -> List:
+    """
+    Run ascrape(session, item) for every item over one shared aiohttp session.
+    
+    At most `concurrency` items run at a time; each may have two requests
+    in flight (e.g. audience and critic pages).
+    
+    Args:
+        items: Items to scrape
+        concurrency: Items scraped concurrently
+        ascrape: Coroutine function (session, item)
+        headers: Default headers of the aiohttp session
+    
+    Returns:
+        Results aligned with items
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=2 * concurrency, keepalive_timeout=30)
+    
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        async def scrape(item):
+            async with semaphore:
+                return await ascrape(session, item)
+        
+        return await asyncio.gather(*(scrape(item) for item in items))
@@ -0,0 +1,20 @@
+"""
+XPath helpers for the HTML scrapers.
+"""
+
+
+def class_step(tag: str, class_name: str) -> str:
+    """
+    XPath step for tag elements whose class list contains class_name.
+    
+    Matches whole class tokens (like BeautifulSoup's class_= and CSS .name),
+    not substrings of the class attribute.
+    
+    Args:
+        tag: Element name
+        class_name: Class token to match
+    
+    Returns:
+        XPath step such as "div[contains(concat(' ', ...), ' review-row ')]"
+    """
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
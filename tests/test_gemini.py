@@ -5,8 +5,10 @@ Test script to verify Gemini API key works.
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.append(str(Path(__file__).parent.parent / 'src'))
+# Add src to path (once, even if this module is re-imported)
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from scrapers.gemini_search import GeminiSearchTermGenerator
 import json
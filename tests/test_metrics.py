@@ -0,0 +1,33 @@
+"""
+Tests for the ranking metrics.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path (once, even if this module is re-imported)
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from evaluation.metrics import RecommenderEvaluator
+
+
+def test_average_precision_counts_duplicate_relevant_ids():
+    """A relevant ID recommended twice adds a second hit, as the original loop did"""
+    evaluator = RecommenderEvaluator()
+    recommendations = [2, 1, 1]
+    
+    # Hits at ranks 2 and 3: (1/2 + 2/3) / 2
+    expected = (1 / 2 + 2 / 3) / 2
+    assert evaluator.average_precision(recommendations, [1]) == pytest.approx(expected)
+    assert evaluator.mean_average_precision([recommendations], [[1]]) == pytest.approx(expected)
+    
+    # Hits at ranks 1, 2 and 4 once every relevant item has already been found
+    recommendations = [1, 2, 3, 1]
+    expected = (1 / 1 + 2 / 2 + 3 / 4) / 3
+    assert evaluator.average_precision(recommendations, [1, 2]) == pytest.approx(expected)
+    assert evaluator.mean_average_precision([recommendations], [[1, 2]]) == pytest.approx(expected)
+
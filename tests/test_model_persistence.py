@@ -0,0 +1,157 @@
+"""
+Round-trip tests for saving and loading the recommendation models.
+"""
+
+import sys
+import pickle
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add src to path (once, even if this module is re-imported)
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from models.collaborative import CollaborativeFilter
+
+
+def _ratings(n_users: int = 30, n_movies: int = 40, per_user: int = 12, seed: int = 0):
+    """Random UserRating-like records"""
+    rng = np.random.default_rng(seed)
+    ratings = []
+    for user_id in range(1, n_users + 1):
+        for movie_id in rng.choice(np.arange(100, 100 + n_movies), size=per_user, replace=False):
+            ratings.append(SimpleNamespace(
+                user_id=user_id, movie_id=int(movie_id), rating=float(rng.integers(1, 6))
+            ))
+    return ratings
+
+
+def _assert_same_cf_predictions(expected: CollaborativeFilter, actual: CollaborativeFilter):
+    """Both models score, rank and relate every user and movie identically"""
+    assert actual.user_ids == expected.user_ids
+    assert actual.movie_ids == expected.movie_ids
+    for user_id in expected.user_ids:
+        np.testing.assert_array_equal(
+            actual.predict_ratings(user_id, expected.movie_ids),
+            expected.predict_ratings(user_id, expected.movie_ids)
+        )
+        assert actual.recommend_for_user(user_id, top_k=5) == expected.recommend_for_user(user_id, top_k=5)
+    for movie_id in expected.movie_ids[:5]:
+        assert actual.get_similar_movies(movie_id, top_k=5) == expected.get_similar_movies(movie_id, top_k=5)
+
+
+def test_collaborative_save_load_round_trip(tmp_path):
+    """save() then load() gives identical predictions"""
+    model = CollaborativeFilter(n_factors=8).fit(_ratings())
+    # Saved factors are float32; compare against the same precision
+    model.user_factors = model.user_factors.astype(np.float32)
+    model.item_factors = model.item_factors.astype(np.float32)
+    
+    path = str(tmp_path / 'cf_model')
+    model.save(path)
+    
+    loaded = CollaborativeFilter()
+    loaded.load(path)
+    
+    assert loaded.n_factors == 8
+    assert (loaded.rating_matrix != model.rating_matrix).nnz == 0
+    _assert_same_cf_predictions(model, loaded)
+
+
+def test_collaborative_loads_legacy_pickle(tmp_path):
+    """A model pickled by the old save() still loads"""
+    from sklearn.decomposition import TruncatedSVD
+    
+    model = CollaborativeFilter(n_factors=8).fit(_ratings())
+    svd = TruncatedSVD(n_components=8, random_state=42)
+    user_factors = svd.fit_transform(model.rating_matrix)
+    
+    path = tmp_path / 'cf_model.pkl'
+    with open(path, 'wb') as f:
+        pickle.dump({
+            'svd': svd,
+            'user_factors': user_factors,
+            'item_factors': svd.components_.T,
+            'user_ids': model.user_ids,
+            'movie_ids': model.movie_ids,
+            'rating_matrix': model.rating_matrix
+        }, f)
+    
+    loaded = CollaborativeFilter()
+    loaded.load(str(path))
+    
+    assert loaded.n_factors == 8
+    np.testing.assert_array_equal(loaded.singular_values, svd.singular_values_)
+    np.testing.assert_allclose(
+        loaded.predict_ratings(model.user_ids[0], model.movie_ids),
+        np.clip(svd.components_.T @ user_factors[0], 1.0, 5.0)
+    )
+    
+    # Re-saving converts it to the current format
+    loaded.save(str(tmp_path / 'cf_model'))
+    converted = CollaborativeFilter()
+    converted.load(str(tmp_path / 'cf_model'))
+    np.testing.assert_allclose(
+        converted.predict_ratings(model.user_ids[0], model.movie_ids),
+        loaded.predict_ratings(model.user_ids[0], model.movie_ids),
+        rtol=1e-5
+    )
+
+
+def _content_model():
+    """ContentBasedFilter fitted on a toy corpus with random embeddings (no database or network)"""
+    content_based = pytest.importorskip('models.content_based', exc_type=ImportError)
+    
+    model = content_based.ContentBasedFilter(embedding_model='missing-model')
+    
+    texts = [
+        'space adventure with robots', 'robots in space battle', 'romantic comedy in paris',
+        'paris love story comedy', 'haunted house horror', 'horror in an old house'
+    ]
+    model.movie_ids = list(range(1, len(texts) + 1))
+    model.movie_idx_map = {mid: idx for idx, mid in enumerate(model.movie_ids)}
+    model.movie_metadata = {mid: {'title': f'Movie {mid}'} for mid in model.movie_ids}
+    model.tfidf_matrix = model.tfidf_vectorizer.fit_transform(texts)
+    model._set_embeddings(np.random.default_rng(0).standard_normal((len(texts), 16)))
+    return model
+
+
+def test_content_based_save_load_round_trip(tmp_path):
+    """save() then load() gives identical similar-movie lists"""
+    model = _content_model()
+    
+    path = str(tmp_path / 'cbf_model')
+    model.save(path)
+    
+    loaded = type(model)(embedding_model='missing-model')
+    loaded.load(path)
+    
+    assert loaded.movie_metadata == model.movie_metadata
+    np.testing.assert_array_equal(loaded.embeddings, model.embeddings)
+    for movie_id in model.movie_ids:
+        assert loaded.get_similar_movies(movie_id, top_k=3) == model.get_similar_movies(movie_id, top_k=3)
+
+
+def test_content_based_loads_legacy_pickle(tmp_path):
+    """A model pickled by the old save() still loads"""
+    model = _content_model()
+    
+    path = tmp_path / 'cbf_model.pkl'
+    with open(path, 'wb') as f:
+        pickle.dump({
+            'tfidf_vectorizer': model.tfidf_vectorizer,
+            'tfidf_matrix': model.tfidf_matrix,
+            'movie_ids': model.movie_ids,
+            'movie_metadata': model.movie_metadata,
+            'embeddings': model.embeddings
+        }, f)
+    
+    loaded = type(model)(embedding_model='missing-model')
+    loaded.load(str(path))
+    
+    for movie_id in model.movie_ids:
+        assert loaded.get_similar_movies(movie_id, top_k=3) == model.get_similar_movies(movie_id, top_k=3)
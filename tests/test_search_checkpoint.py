@@ -0,0 +1,70 @@
+"""
+Resume tests for the batch search-term checkpoint.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path (once, even if this module is re-imported)
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from scrapers.gemini_search import GeminiSearchTermGenerator, _JsonlCheckpoint
+
+
+def _terms(title: str):
+    """Search terms for one movie"""
+    return {platform: [f"{title} {platform} {i}" for i in range(3)]
+            for platform in ('reddit', 'twitter', 'imdb', 'general')}
+
+
+def test_checkpoint_resume_skips_truncated_last_line(tmp_path):
+    """A record torn by a crash is ignored, and later appends start on a fresh line"""
+    path = tmp_path / 'checkpoint.jsonl'
+    
+    with _JsonlCheckpoint(path) as checkpoint:
+        checkpoint.append(1, _terms('One'))
+        checkpoint.append(2, _terms('Two'))
+    
+    # Crash part-way through writing the third record
+    with open(path, 'ab') as f:
+        f.write(b'{"movie_id": 3, "terms": {"reddit": ["Thr')
+    
+    assert _JsonlCheckpoint(path).load() == {1: _terms('One'), 2: _terms('Two')}
+    
+    # Resuming drops only the movies already recorded
+    movies = [{'id': movie_id, 'title': f'Movie {movie_id}'} for movie_id in (1, 2, 3, 4)]
+    checkpoint, results, remaining = GeminiSearchTermGenerator._resume(movies, path)
+    assert set(results) == {1, 2}
+    assert [movie['id'] for movie in remaining] == [3, 4]
+    
+    with checkpoint:
+        checkpoint.append(3, _terms('Three'))
+        checkpoint.append(4, _terms('Four'))
+    
+    assert _JsonlCheckpoint(path).load() == {
+        1: _terms('One'), 2: _terms('Two'), 3: _terms('Three'), 4: _terms('Four')
+    }
+    assert len(path.read_bytes().splitlines()) == 5  # Two records, the torn line, two more records
+
+
+def test_checkpoint_load_skips_malformed_records(tmp_path):
+    """Lines that parse as JSON but are not checkpoint records are ignored"""
+    path = tmp_path / 'checkpoint.jsonl'
+    
+    with _JsonlCheckpoint(path) as checkpoint:
+        checkpoint.append(1, _terms('One'))
+    
+    with open(path, 'ab') as f:
+        f.write(b'null\n[1, 2]\n"text"\n{"movie_id": 2}\n{"terms": {}}\n{"movie_id": [3], "terms": {}}\n')
+    
+    with _JsonlCheckpoint(path) as checkpoint:
+        checkpoint.append(4, _terms('Four'))
+    
+    assert _JsonlCheckpoint(path).load() == {1: _terms('One'), 4: _terms('Four')}
+
+
+def test_checkpoint_load_missing_file(tmp_path):
+    """No checkpoint yet means nothing is done"""
+    assert _JsonlCheckpoint(tmp_path / 'missing.jsonl').load() == {}